@@ -9,8 +9,21 @@ __version__ = "1.0.0"
 __author__ = "Arweave Ecosystem"
 __email__ = "contact@arweave.org"
 
-from .core.podcast_generator import PodcastGenerator
-from .services.gemini_service import GeminiService
-from .services.data_service import DataService
-
 __all__ = ["PodcastGenerator", "GeminiService", "DataService"]
+
+# Public classes are imported on first access so that importing a submodule
+# (e.g. the utils) doesn't pull in every service and its dependencies
+_LAZY_IMPORTS = {
+    "PodcastGenerator": ".core.podcast_generator",
+    "GeminiService": ".services.gemini_service",
+    "DataService": ".services.data_service",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
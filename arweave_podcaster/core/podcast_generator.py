@@ -5,23 +5,37 @@ This module contains the core PodcastGenerator class that orchestrates the entir
 podcast generation process.
 """
 
+import hashlib
+import logging
 import os
-from typing import Dict, Any, Optional, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, Optional, List
 
 from ..services.data_service import DataService, get_user_choice_for_data_source
-from ..services.gemini_service import GeminiService, create_gemini_service
 from ..services.video_service import VideoService, create_video_service
-from ..utils.config import config
+from ..utils.config import PROJECT_ROOT, config
+from ..utils.logging_utils import configure_logging
 from ..utils.file_utils import (
-    get_date_folder_from_timestamp, get_formatted_date_from_timestamp,
-    get_datestamp_from_timestamp, create_output_filename, save_text_file,
-    ensure_directory_exists
+    get_dates_from_timestamp, create_output_filename, save_text_file,
+    ensure_directory_exists, load_json_file, save_json_file, load_text_file,
+    compute_content_hash, json_loads
 )
 from ..utils.text_utils import (
     clean_script_for_audio, format_news_topics, format_chitchat_section,
     format_suggested_read, create_podcast_opening, create_podcast_closing
 )
 
+if TYPE_CHECKING:
+    from ..services.gemini_service import GeminiService
+
+logger = logging.getLogger(__name__)
+
+
+def _integrations_cache_path() -> str:
+    """Get the file recording recent successful integration checks."""
+    return os.path.join(config.CACHE_DIR, 'integrations.json')
+
 
 class PodcastGenerator:
     """Main class for generating podcasts from Arweave news data."""
@@ -35,7 +49,7 @@ class PodcastGenerator:
         """
         self.base_dir = base_dir
         self.data_service = DataService(base_dir)
-        self.gemini_service: Optional[GeminiService] = None
+        self.gemini_service: Optional["GeminiService"] = None
         self.video_service: Optional[VideoService] = None
         
         # Test and initialize services
@@ -43,183 +57,206 @@ class PodcastGenerator:
     
     def _initialize_services(self) -> None:
         """Initialize available services."""
-        print("🔧 Initializing services...")
+        logger.info("🔧 Initializing services...")
         
         # Initialize Gemini service
         if config.is_gemini_configured():
+            # Imported here: the Google SDKs are slow to import and unused without a key
+            from ..services.gemini_service import create_gemini_service
+            
             self.gemini_service = create_gemini_service()
-            if self.gemini_service and self.gemini_service.test_connection():
-                print("✅ Gemini AI service initialized")
+            if self.gemini_service and self._check_gemini_connection():
+                logger.info("✅ Gemini AI service initialized")
             else:
-                print("❌ Gemini AI service failed to initialize")
+                logger.error("❌ Gemini AI service failed to initialize")
                 self.gemini_service = None
         else:
-            print("⚠️ Gemini AI not configured")
+            logger.warning("⚠️ Gemini AI not configured")
     
-    def generate_podcast(self, user_choice: str = "auto") -> bool:
+    def _check_gemini_connection(self) -> bool:
+        """
+        Test the Gemini connection, reusing a recent successful check.
+        
+        Returns:
+            True if Gemini is reachable, False otherwise
+        """
+        cache_path = _integrations_cache_path()
+        # Hash the key so the cache never stores the secret itself
+        key_hash = hashlib.blake2b(config.GEMINI_API_KEY.encode(), digest_size=8).hexdigest()
+        
+        cached = load_json_file(cache_path) if os.path.exists(cache_path) else None
+        gemini_check = (cached or {}).get('gemini', {})
+        if (gemini_check.get('key_hash') == key_hash
+                and time.time() - gemini_check.get('checked_at', 0) < config.INTEGRATION_CHECK_TTL):
+            logger.info("✅ Gemini connection verified recently, skipping check")
+            return True
+        
+        if not self.gemini_service.test_connection():
+            return False
+        
+        save_json_file({'gemini': {'key_hash': key_hash, 'checked_at': time.time()}}, cache_path)
+        return True
+    
+    def _forget_gemini_connection(self) -> None:
+        """Drop the cached Gemini check so the next run tests the connection again."""
+        cache_path = _integrations_cache_path()
+        cached = load_json_file(cache_path) if os.path.exists(cache_path) else None
+        if cached and cached.pop('gemini', None) is not None:
+            save_json_file(cached, cache_path)
+            logger.debug("Cleared cached Gemini connection check after a failed request")
+    
+    def generate_podcast(self, user_choice: str = "auto", use_cache: bool = True,
+                         interactive: bool = True) -> bool:
         """
         Generate a complete podcast from news data.
         
         Args:
             user_choice: Data source choice ('online', 'local', 'auto')
+            use_cache: Reuse recently fetched news data, cached scripts and unchanged podcasts
+            interactive: Whether the user may be prompted while loading data
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            print("🎙️  ARWEAVE TODAY PODCAST GENERATOR")
-            print("="*50)
+            logger.info("🎙️  ARWEAVE TODAY PODCAST GENERATOR")
+            logger.info("="*50)
             
             # Load news data
-            news_data = self.data_service.load_news_data_smart(user_choice)
+            news_data = self.data_service.load_news_data_smart(user_choice, use_cache, interactive)
             if not news_data:
-                print("❌ No news data available")
+                logger.error("❌ No news data available")
                 return False
             
-            # Setup output directories
-            timestamp_ms = news_data.get('ts', 0)
-            date_folder = get_date_folder_from_timestamp(timestamp_ms)
-            date_str = get_formatted_date_from_timestamp(timestamp_ms)
-            datestamp = get_datestamp_from_timestamp(timestamp_ms)
-            
-            output_dir = config.get_output_dir(self.base_dir, date_folder)
-            ensure_directory_exists(output_dir)
-            
-            print(f"📁 Output directory: output/{date_folder}")
-            
-            # Initialize video service for this generation
-            self.video_service = create_video_service(output_dir)
-            
-            # Generate raw script
-            print("📝 Generating raw podcast script...")
-            raw_script = self._generate_raw_script(news_data, date_str)
-            
-            # Enhance script with AI if available
-            if self.gemini_service and config.ENABLE_GEMINI_SCRIPT_GENERATION:
-                print("🤖 Enhancing script with Gemini AI...")
-                final_script = self.gemini_service.generate_podcast_script(raw_script, date_str)
-            else:
-                print("📄 Using raw script (AI enhancement not available)")
-                final_script = raw_script
-            
-            # Save scripts
-            base_filename = "ArweaveToday"
-            raw_filename = create_output_filename(base_filename, datestamp, "raw.txt")
-            final_filename = create_output_filename(base_filename, datestamp, "txt")
-            audio_filename = create_output_filename(base_filename, datestamp, "wav")
-            
-            raw_path = os.path.join(output_dir, raw_filename)
-            final_path = os.path.join(output_dir, final_filename)
-            audio_path = os.path.join(output_dir, audio_filename)
-            
-            print("💾 Saving scripts...")
-            save_text_file(raw_script, raw_path)
-            save_text_file(final_script, final_path)
-            
-            # Generate audio
-            if self.gemini_service:
-                print("🎤 Generating podcast audio...")
-                cleaned_script = clean_script_for_audio(final_script)
-                success = self.gemini_service.generate_audio(cleaned_script, audio_path)
-                if not success:
-                    print("⚠️ Audio generation failed")
-            else:
-                print("⚠️ Audio generation skipped (Gemini not available)")
-                success = False
-            
-            # Print summary
-            self._print_generation_summary(output_dir, raw_filename, final_filename, 
-                                         audio_filename if success else None)
-            
+            self._generate_from_news_data(news_data, use_cache)
             return True
             
         except Exception as e:
-            print(f"❌ Error during podcast generation: {e}")
+            logger.error(f"❌ Error during podcast generation: {e}")
             return False
     
-    def generate_podcast_from_file(self, json_file_path: str) -> Optional[str]:
+    def generate_podcast_from_file(self, json_file_path: str,
+                                   use_cache: bool = True) -> Optional[str]:
         """
         Generate a podcast directly from a JSON file.
         
         Args:
             json_file_path: Path to the JSON file containing news data
+            use_cache: Reuse the existing podcast and cached scripts for unchanged content
             
         Returns:
             Output directory path if successful, None otherwise
         """
         try:
-            # Load news data from file
-            import json
-            
             if not os.path.exists(json_file_path):
-                print(f"❌ JSON file not found: {json_file_path}")
+                logger.error(f"❌ JSON file not found: {json_file_path}")
                 return False
             
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                news_data = json.load(f)
-            
-            print(f"✅ Loaded news data from: {json_file_path}")
-            
-            # Setup output directories
-            timestamp_ms = news_data.get('ts', 0)
-            date_folder = get_date_folder_from_timestamp(timestamp_ms)
-            date_str = get_formatted_date_from_timestamp(timestamp_ms)
-            datestamp = get_datestamp_from_timestamp(timestamp_ms)
+            # Parse the raw bytes directly (orjson when available)
+            with open(json_file_path, 'rb') as f:
+                news_data = json_loads(f.read())
             
-            output_dir = config.get_output_dir(self.base_dir, date_folder)
-            ensure_directory_exists(output_dir)
+            logger.info(f"✅ Loaded news data from: {json_file_path}")
             
-            print(f"📁 Output directory: output/{date_folder}")
+            return self._generate_from_news_data(news_data, use_cache)
             
-            # Initialize video service for this generation
-            self.video_service = create_video_service(output_dir)
+        except Exception as e:
+            logger.error(f"❌ Error processing JSON file: {e}")
+            return None
+    
+    def _generate_from_news_data(self, news_data: Dict[str, Any],
+                                 use_cache: bool = True) -> str:
+        """
+        Run the script, enhancement and audio pipeline for loaded news data.
+        
+        Unless use_cache is False, the pipeline is skipped when the news content
+        is identical to the content the existing audio was generated from.
+        
+        Args:
+            news_data: Dictionary containing news data
+            use_cache: Reuse the existing podcast and cached Gemini scripts
             
-            # Generate raw script
-            print("📝 Generating raw podcast script...")
-            raw_script = self._generate_raw_script(news_data, date_str)
+        Returns:
+            Output directory path
+        """
+        # Setup output directories
+        date_folder, date_str, datestamp = get_dates_from_timestamp(news_data.get('ts', 0))
+        
+        output_dir = config.get_output_dir(self.base_dir, date_folder)
+        ensure_directory_exists(output_dir)
+        
+        logger.info(f"📁 Output directory: output/{date_folder}")
+        
+        base_filename = "ArweaveToday"
+        raw_filename = create_output_filename(base_filename, datestamp, "raw.txt")
+        final_filename = create_output_filename(base_filename, datestamp, "txt")
+        audio_filename = create_output_filename(base_filename, datestamp, "wav")
+        hash_filename = create_output_filename(base_filename, datestamp, "hash")
+        
+        raw_path = os.path.join(output_dir, raw_filename)
+        final_path = os.path.join(output_dir, final_filename)
+        audio_path = os.path.join(output_dir, audio_filename)
+        hash_path = os.path.join(output_dir, hash_filename)
+        
+        # Skip everything if this exact content was already turned into audio
+        content_hash = compute_content_hash(news_data)
+        if (use_cache and os.path.exists(audio_path) and os.path.exists(final_path)
+                and os.path.exists(hash_path) and load_text_file(hash_path) == content_hash):
+            logger.info("⏭️  News content unchanged since the last generation, reusing existing podcast")
+            self._print_generation_summary(output_dir, raw_filename, final_filename, audio_filename)
+            return output_dir
+        
+        # Initialize video service for this generation
+        self.video_service = create_video_service(
+            output_dir, config.get_transcript_cache_dir(self.base_dir))
+        
+        # Generate raw script
+        logger.info("📝 Generating raw podcast script...")
+        raw_script = self._generate_raw_script(news_data, date_str)
+        
+        # Script files are written in the background while Gemini calls are in flight
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            logger.info("💾 Saving scripts...")
+            raw_save = executor.submit(save_text_file, raw_script, raw_path)
             
             # Enhance script with AI if available
             if self.gemini_service and config.ENABLE_GEMINI_SCRIPT_GENERATION:
-                print("🤖 Enhancing script with Gemini AI...")
-                final_script = self.gemini_service.generate_podcast_script(raw_script, date_str)
+                logger.info("🤖 Enhancing script with Gemini AI...")
+                final_script = self.gemini_service.generate_podcast_script(
+                    raw_script, date_str, use_cache=use_cache)
+                # The raw script comes back unchanged when the request fails
+                if final_script == raw_script:
+                    self._forget_gemini_connection()
             else:
-                print("📄 Using raw script (AI enhancement not available)")
+                logger.info("📄 Using raw script (AI enhancement not available)")
                 final_script = raw_script
             
-            # Save scripts
-            base_filename = "ArweaveToday"
-            raw_filename = create_output_filename(base_filename, datestamp, "raw.txt")
-            final_filename = create_output_filename(base_filename, datestamp, "txt")
-            audio_filename = create_output_filename(base_filename, datestamp, "wav")
-            
-            raw_path = os.path.join(output_dir, raw_filename)
-            final_path = os.path.join(output_dir, final_filename)
-            audio_path = os.path.join(output_dir, audio_filename)
-            
-            print("💾 Saving scripts...")
-            save_text_file(raw_script, raw_path)
-            save_text_file(final_script, final_path)
+            final_save = executor.submit(save_text_file, final_script, final_path)
             
             # Generate audio
             if self.gemini_service:
-                print("🎤 Generating podcast audio...")
+                logger.info("🎤 Generating podcast audio...")
                 cleaned_script = clean_script_for_audio(final_script)
                 success = self.gemini_service.generate_audio(cleaned_script, audio_path)
                 if not success:
-                    print("⚠️ Audio generation failed")
+                    logger.warning("⚠️ Audio generation failed")
+                    self._forget_gemini_connection()
             else:
-                print("⚠️ Audio generation skipped (Gemini not available)")
+                logger.warning("⚠️ Audio generation skipped (Gemini not available)")
                 success = False
             
-            # Print summary
-            self._print_generation_summary(output_dir, raw_filename, final_filename, 
-                                         audio_filename if success else None)
-            
-            return output_dir
-            
-        except Exception as e:
-            print(f"❌ Error processing JSON file: {e}")
-            return None
+            raw_save.result()
+            final_save.result()
+        
+        # Remember which content the audio was generated from
+        if success:
+            save_text_file(content_hash, hash_path)
+        
+        # Print summary
+        self._print_generation_summary(output_dir, raw_filename, final_filename, 
+                                     audio_filename if success else None)
+        
+        return output_dir
 
     def _generate_raw_script(self, news_data: Dict[str, Any], date_str: str) -> str:
         """
@@ -232,39 +269,28 @@ class PodcastGenerator:
         Returns:
             Raw script text
         """
-        script_parts = []
-        
-        # Opening
-        script_parts.append(create_podcast_opening(date_str))
-        script_parts.append("")
+        # Each section is built as a single string and the script joined once
+        sections = [create_podcast_opening(date_str)]
         
         # Process topics with video transcription
         topics = news_data.get('topics', [])
         if topics:
-            topics_content = self._process_topics_with_videos(topics)
-            script_parts.append(topics_content)
-            script_parts.append("")
+            sections.append(self._process_topics_with_videos(topics))
         
         # Chitchat section
         chitchat = news_data.get('chitchat', {})
         if chitchat:
-            chitchat_content = format_chitchat_section(chitchat)
-            if chitchat_content:
-                script_parts.append(chitchat_content)
-                script_parts.append("")
+            sections.append(format_chitchat_section(chitchat))
         
         # Suggested reading
         suggested = news_data.get('suggested', {})
         if suggested:
-            suggested_content = format_suggested_read(suggested)
-            if suggested_content:
-                script_parts.append(suggested_content)
-                script_parts.append("")
+            sections.append(format_suggested_read(suggested))
         
         # Closing
-        script_parts.append(create_podcast_closing())
+        sections.append(create_podcast_closing())
         
-        return "\n".join(script_parts)
+        return "\n\n".join(section for section in sections if section)
     
     def _process_topics_with_videos(self, topics: List[Dict[str, Any]]) -> str:
         """
@@ -276,23 +302,27 @@ class PodcastGenerator:
         Returns:
             Formatted topics content with video transcriptions
         """
-        enhanced_topics = []
+        enhanced_topics = [topic.copy() for topic in topics]
+        video_topics = []
+        if self.video_service:
+            video_topics = [(i, topic) for i, topic in enumerate(enhanced_topics, 1)
+                            if topic.get('video')]
         
-        for i, topic in enumerate(topics):
-            enhanced_topic = topic.copy()
-            
-            # Check for video content
-            video_url = topic.get('video')
-            if video_url and self.video_service:
-                topic_id = f"topic_{i+1}"
-                transcript = self.video_service.transcribe_video(video_url, topic_id)
+        if video_topics:
+            # Downloads are network bound, so fetch all videos concurrently
+            max_workers = max(1, min(config.VIDEO_MAX_WORKERS, len(video_topics)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                transcripts = executor.map(
+                    self.video_service.transcribe_video,
+                    [topic['video'] for _, topic in video_topics],
+                    [f"topic_{i}" for i, _ in video_topics],
+                )
                 
-                if transcript:
-                    # Append transcript to body
-                    current_body = enhanced_topic.get('body', '')
-                    enhanced_topic['body'] = f"{current_body}\n\nVideo content: {transcript}"
-            
-            enhanced_topics.append(enhanced_topic)
+                for (_, enhanced_topic), transcript in zip(video_topics, transcripts):
+                    if transcript:
+                        # Append transcript to body
+                        current_body = enhanced_topic.get('body', '')
+                        enhanced_topic['body'] = f"{current_body}\n\nVideo content: {transcript}"
         
         return format_news_topics(enhanced_topics)
     
@@ -307,50 +337,57 @@ class PodcastGenerator:
             final_filename: Final script filename
             audio_filename: Audio filename or None if not generated
         """
-        print("\n" + "="*50)
-        print("✅ PODCAST GENERATION COMPLETE!")
-        print("="*50)
-        print(f"📄 Raw Script: {raw_filename}")
-        print(f"🎯 Final Script: {final_filename}")
+        logger.info("\n" + "="*50)
+        logger.info("✅ PODCAST GENERATION COMPLETE!")
+        logger.info("="*50)
+        logger.info(f"📄 Raw Script: {raw_filename}")
+        logger.info(f"🎯 Final Script: {final_filename}")
         if audio_filename:
-            print(f"🎵 Audio File: {audio_filename}")
-        print(f"📁 Location: {output_dir}")
+            logger.info(f"🎵 Audio File: {audio_filename}")
+        logger.info(f"📁 Location: {output_dir}")
         
         if self.gemini_service:
-            print("🤖 Enhanced with Gemini AI")
+            logger.info("🤖 Enhanced with Gemini AI")
         
-        print("="*50)
+        logger.info("="*50)
 
 
-def main(json_file: Optional[str] = None) -> None:
-    """Main entry point for the podcast generator."""
+def main(json_file: Optional[str] = None, use_cache: bool = True,
+         source: Optional[str] = None, interactive: bool = True) -> None:
+    """
+    Main entry point for the podcast generator.
+    
+    Args:
+        json_file: News data file to use instead of choosing a data source
+        use_cache: Reuse recently fetched news data, cached scripts and unchanged podcasts
+        source: Data source ('online', 'local', 'auto') to use without prompting
+        interactive: Whether the data source menu may be shown
+    """
+    configure_logging()
+    
     try:
-        # Get base directory (project root)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        base_dir = os.path.dirname(os.path.dirname(script_dir))  # Go up to project root
-        
-        # Create generator
-        generator = PodcastGenerator(base_dir)
+        # Create generator rooted at the project directory
+        generator = PodcastGenerator(PROJECT_ROOT)
         
         if json_file:
             # Direct JSON file mode
-            print(f"📁 Using provided JSON file: {json_file}")
-            output_dir = generator.generate_podcast_from_file(json_file)
+            logger.info(f"📁 Using provided JSON file: {json_file}")
+            output_dir = generator.generate_podcast_from_file(json_file, use_cache)
             success = output_dir is not None
         else:
-            # Interactive mode - get user choice for data source
-            user_choice = get_user_choice_for_data_source()
-            success = generator.generate_podcast(user_choice)
+            # Data source from the command line, or the interactive menu
+            user_choice = get_user_choice_for_data_source(source, interactive)
+            success = generator.generate_podcast(user_choice, use_cache, interactive)
         
         if not success:
-            print("❌ Podcast generation failed")
+            logger.error("❌ Podcast generation failed")
             exit(1)
             
     except KeyboardInterrupt:
-        print("\n🛑 Operation cancelled by user")
+        logger.info("\n🛑 Operation cancelled by user")
         exit(1)
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+        logger.error(f"❌ Unexpected error: {e}")
         exit(1)
 
 
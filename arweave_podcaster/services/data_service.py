@@ -4,21 +4,34 @@ Data service for fetching and managing news data.
 This module handles fetching news data from online sources and managing local data files.
 """
 
-import requests
-import urllib3
+import logging
 import os
-from typing import Dict, Any, Optional, List
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple
+from urllib.parse import urlparse
 from datetime import datetime
 
+from ..utils.circuit_breaker import CircuitBreaker
 from ..utils.config import config
+from ..utils.http_utils import get_http_session
+from ..utils.logging_utils import flush_logging
 from ..utils.file_utils import (
-    save_json_file, load_json_file, ensure_directory_exists,
-    get_date_folder_from_timestamp, find_most_recent_date_directory
+    save_json_file, load_json_file, json_loads, ensure_directory_exists,
+    get_dates_from_timestamp, find_most_recent_date_directory
 )
 
-# Suppress SSL warnings when verification is disabled
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+if TYPE_CHECKING:
+    import requests
 
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts: fail fast on dead hosts, allow a slow body
+_TIMEOUT = (3.05, 10)
+
+# Content types treated as JSON (compared without parameters such as charset)
+_JSON_CTYPES = frozenset({'application/json', 'text/json'})
 
 class DataService:
     """Service for managing news data fetching and storage."""
@@ -32,12 +45,21 @@ class DataService:
         """
         self.base_dir = base_dir
         self.data_dir = os.path.join(base_dir, 'data')
+        self.http_cache_path = os.path.join(self.data_dir, '.http_cache.json')
+        self.circuit_breaker = CircuitBreaker(
+            os.path.join(config.CACHE_DIR, 'news_source_circuit.json'),
+            failure_threshold=config.NEWS_SOURCE_FAILURE_THRESHOLD,
+            reset_timeout=config.NEWS_SOURCE_RETRY_AFTER,
+        )
         ensure_directory_exists(self.data_dir)
     
     def fetch_online_news_data(self, url: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Fetch the latest Arweave Today JSON data from online source.
         
+        Skips the network entirely while the news source circuit is open after
+        repeated failures. Invalid or empty payloads are retried with backoff.
+        
         Args:
             url: URL to fetch data from. If None, uses config.NEWS_SOURCE_URL
             
@@ -46,43 +68,200 @@ class DataService:
         """
         if url is None:
             url = config.NEWS_SOURCE_URL
+        
+        if not self.circuit_breaker.allow_request():
+            logger.warning("⚠️ News source failed repeatedly, skipping online fetch for now")
+            return None
+        
+        # The breaker counts one failure per run, however many attempts were made
+        news_data = self._fetch_with_retries(url)
+        if news_data:
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+        return news_data
+    
+    def _fetch_with_retries(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch news data, waiting and retrying when the source returns a bad payload.
+        
+        Network errors and retryable HTTP statuses are already retried by the
+        shared session's adapter, so they are not retried again here.
+        
+        Args:
+            url: URL to fetch data from
             
+        Returns:
+            Dictionary containing news data, or None if every attempt failed
+        """
+        attempts = max(1, config.NEWS_FETCH_ATTEMPTS)
+        for attempt in range(attempts):
+            news_data, retryable = self._fetch_from_source(url)
+            if news_data:
+                return news_data
+            if not retryable or attempt + 1 == attempts:
+                break
+            
+            delay = min(config.NEWS_FETCH_RETRY_DELAY * 2 ** attempt, config.NEWS_FETCH_MAX_DELAY)
+            logger.info(f"🔄 Retrying online fetch in {delay:.1f}s "
+                        f"(attempt {attempt + 2}/{attempts})...")
+            time.sleep(delay)
+        return None
+    
+    def _fetch_from_source(self, url: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Fetch news data from a URL, falling back to alternative JSON endpoints.
+        
+        Args:
+            url: URL to fetch data from
+            
+        Returns:
+            Tuple of (news data or None, whether the failure is worth retrying).
+            Only invalid or empty payloads are retryable; network errors have
+            already been retried by the session.
+        """
+        import requests
+        
         try:
-            print(f"🌐 Fetching latest news data from: {url}")
+            logger.info(f"🌐 Fetching latest news data from: {url}")
             
-            # Try with SSL verification first
-            try:
-                response = requests.get(url, timeout=30, verify=True)
-                response.raise_for_status()
-            except requests.exceptions.SSLError:
-                print("⚠️ SSL verification failed, retrying without SSL verification...")
-                # Fallback without SSL verification
-                response = requests.get(url, timeout=30, verify=False)
-                response.raise_for_status()
+            # Revalidate against the copy saved by the previous fetch
+            cache_meta = self._load_http_cache_meta(url)
+            response = self._get_with_ssl_fallback(url, self._conditional_headers(cache_meta))
+            
+            if response.status_code == 304:
+                cached_data = load_json_file(cache_meta['path'])
+                if cached_data:
+                    logger.info("✅ News data unchanged since last fetch, using saved copy")
+                    return cached_data, False
+                # Saved copy is gone; fetch the full payload again
+                response = self._get_with_ssl_fallback(url)
             
             # Check if response is JSON
-            content_type = response.headers.get('content-type', '').lower()
-            if 'application/json' in content_type or url.endswith('.json'):
+            mimetype = response.headers.get('content-type', '').split(';', 1)[0].strip().lower()
+            if mimetype in _JSON_CTYPES or url.endswith('.json'):
                 # Direct JSON response
-                news_data = response.json()
+                news_data = json_loads(response.content)
+                self._save_http_cache_meta(url, response, news_data)
             else:
                 # Might be HTML page, try to find JSON data or redirect
-                print("🔍 Response is not JSON, checking for data...")
+                logger.info("🔍 Response is not JSON, checking for data...")
                 news_data = self._try_alternative_endpoints(url)
                 
                 if not news_data:
-                    print("❌ Could not find JSON data at any endpoint")
-                    return None
+                    logger.error("❌ Could not find JSON data at any endpoint")
+                    return None, True
             
-            print("✅ Online news data fetched successfully!")
-            return news_data
+            if not news_data:
+                logger.warning("⚠️ News source returned an empty payload")
+                return None, True
+            
+            logger.info("✅ Online news data fetched successfully!")
+            return news_data, False
             
         except requests.exceptions.RequestException as e:
-            print(f"⚠️ Network error fetching news data: {e}")
-            return None
+            logger.warning(f"⚠️ Network error fetching news data: {e}")
+            return None, False
+        except ValueError as e:
+            logger.warning(f"⚠️ Invalid JSON in news data response: {e}")
+            return None, True
         except Exception as e:
-            print(f"⚠️ Error fetching news data: {e}")
-            return None
+            logger.warning(f"⚠️ Error fetching news data: {e}")
+            return None, False
+    
+    def _get_with_ssl_fallback(self, url: str,
+                               headers: Optional[Dict[str, str]] = None) -> "requests.Response":
+        """
+        GET a URL, retrying with certifi's CA bundle and then without SSL
+        verification if the handshake fails.
+        
+        Args:
+            url: URL to fetch
+            headers: Extra request headers
+            
+        Returns:
+            Response object
+            
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        import requests
+        
+        session = get_http_session()
+        try:
+            response = session.get(url, timeout=_TIMEOUT, verify=True, headers=headers)
+        except requests.exceptions.SSLError:
+            import certifi
+            
+            # A stale CA bundle (e.g. via REQUESTS_CA_BUNDLE) is the usual cause,
+            # so retry against certifi's bundle before giving up on verification
+            logger.warning("⚠️ SSL verification failed, retrying with the certifi CA bundle...")
+            try:
+                response = session.get(url, timeout=_TIMEOUT, verify=certifi.where(),
+                                       headers=headers)
+            except requests.exceptions.SSLError:
+                logger.warning("⚠️ SSL verification failed, retrying without SSL verification...")
+                # Fallback without SSL verification
+                response = session.get(url, timeout=_TIMEOUT, verify=False, headers=headers)
+        response.raise_for_status()
+        return response
+    
+    def _load_http_cache_meta(self, url: str) -> Dict[str, Any]:
+        """
+        Load the HTTP validators saved for a URL by the previous fetch.
+        
+        Args:
+            url: URL the validators belong to
+            
+        Returns:
+            Saved metadata, or an empty dict if there is no usable entry
+        """
+        if not os.path.exists(self.http_cache_path):
+            return {}
+        meta = load_json_file(self.http_cache_path) or {}
+        if meta.get('url') != url or not meta.get('path') or not os.path.exists(meta['path']):
+            return {}
+        return meta
+    
+    def _conditional_headers(self, cache_meta: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Build conditional GET headers from saved HTTP validators.
+        
+        Args:
+            cache_meta: Metadata returned by _load_http_cache_meta
+            
+        Returns:
+            Request headers (empty if nothing is cached)
+        """
+        headers = {}
+        if cache_meta.get('etag'):
+            headers['If-None-Match'] = cache_meta['etag']
+        if cache_meta.get('last_modified'):
+            headers['If-Modified-Since'] = cache_meta['last_modified']
+        return headers
+    
+    def _save_http_cache_meta(self, url: str, response: "requests.Response",
+                              news_data: Dict[str, Any]) -> None:
+        """
+        Remember the HTTP validators of a successful fetch.
+        
+        Args:
+            url: URL that was fetched
+            response: Response the news data came from
+            news_data: Parsed news data (its timestamp locates the saved copy)
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified) or 'ts' not in news_data:
+            return
+        
+        date_folder = get_dates_from_timestamp(news_data['ts'])[0]
+        save_json_file({
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'path': os.path.join(self.data_dir, date_folder, 'today.json'),
+        }, self.http_cache_path)
     
     def _try_alternative_endpoints(self, base_url: str) -> Optional[Dict[str, Any]]:
         """
@@ -94,24 +273,61 @@ class DataService:
         Returns:
             News data if found, None otherwise
         """
-        json_urls = [
-            base_url.rstrip('/') + '/data.json',
-            base_url.rstrip('/') + '/today.json',
-            base_url.rstrip('/') + '/api/today',
-            config.GITHUB_FALLBACK_URL
-        ]
+        base = base_url.rstrip('/')
+        candidates = [config.GITHUB_FALLBACK_URL]
+        if not urlparse(base).path.endswith('.json'):
+            # Sibling paths are only worth trying when the URL isn't already a JSON file
+            candidates[:0] = [base + '/data.json', base + '/today.json', base + '/api/today']
+        # Dedupe while preserving order
+        json_urls = list(dict.fromkeys(candidates))
+        
+        # Paths on the same host are tried in turn so an unreachable host is given
+        # up on after one failure; different hosts are probed in parallel
+        urls_by_host: Dict[str, List[str]] = {}
+        for json_url in json_urls:
+            urls_by_host.setdefault(urlparse(json_url).netloc, []).append(json_url)
+        
+        executor = ThreadPoolExecutor(max_workers=len(urls_by_host))
+        futures = [executor.submit(self._probe_host, host_urls)
+                   for host_urls in urls_by_host.values()]
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                if result:
+                    json_url, news_data = result
+                    logger.info(f"✅ Found JSON data at: {json_url}")
+                    return news_data
+        finally:
+            # Don't wait on slower probes once there is an answer
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        return None
+    
+    def _probe_host(self, json_urls: List[str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Try candidate JSON endpoints on a single host in order.
+        
+        Args:
+            json_urls: URLs on the same host to try
+            
+        Returns:
+            Tuple of (url, parsed news data) for the first JSON answer, or None
+        """
+        import requests
         
         for json_url in json_urls:
             try:
-                print(f"🔄 Trying: {json_url}")
-                response = requests.get(json_url, timeout=30, verify=False)
+                logger.info(f"🔄 Trying: {json_url}")
+                response = get_http_session().get(json_url, timeout=_TIMEOUT, verify=False)
                 if response.status_code == 200:
-                    news_data = response.json()
-                    print(f"✅ Found JSON data at: {json_url}")
-                    return news_data
+                    return json_url, json_loads(response.content)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                # The remaining paths on this host would fail the same way
+                return None
             except Exception:
                 continue
-        
         return None
     
     def save_news_data_locally(self, news_data: Dict[str, Any]) -> bool:
@@ -126,11 +342,11 @@ class DataService:
         """
         try:
             if 'ts' not in news_data:
-                print("⚠️ No timestamp found in news data")
+                logger.warning("⚠️ No timestamp found in news data")
                 return False
             
             timestamp_ms = news_data.get('ts', 0)
-            date_folder = get_date_folder_from_timestamp(timestamp_ms)
+            date_folder = get_dates_from_timestamp(timestamp_ms)[0]
             
             # Create date-based directory
             date_dir = os.path.join(self.data_dir, date_folder)
@@ -139,12 +355,12 @@ class DataService:
             # Save in the date-based directory
             date_file_path = os.path.join(date_dir, 'today.json')
             if save_json_file(news_data, date_file_path):
-                print(f"📅 News data saved in date directory: {date_folder}/today.json")
+                logger.info(f"📅 News data saved in date directory: {date_folder}/today.json")
                 return True
             return False
             
         except Exception as e:
-            print(f"⚠️ Could not save news data locally: {e}")
+            logger.warning(f"⚠️ Could not save news data locally: {e}")
             return False
     
     def load_local_news_data(self, date_folder: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -176,37 +392,69 @@ class DataService:
             return load_json_file(recent_file)
         return None
     
-    def load_news_data_smart(self, user_choice: str = "auto") -> Optional[Dict[str, Any]]:
+    def load_news_data_smart(self, user_choice: str = "auto", use_cache: bool = True,
+                             interactive: bool = True) -> Optional[Dict[str, Any]]:
         """
         Intelligently load news data based on user preference.
         
         Args:
             user_choice: 'online', 'local', or 'auto'
+            use_cache: Reuse recently fetched data instead of going online
+            interactive: Whether the user may be prompted about falling back
             
         Returns:
             News data or None if all sources fail
         """
         if user_choice == "online":
-            return self._handle_online_choice()
+            return self._handle_online_choice(use_cache, interactive)
         elif user_choice == "local":
             return self._handle_local_choice()
         else:  # auto
-            return self._handle_auto_choice()
+            return self._handle_auto_choice(use_cache)
+    
+    def _load_recently_fetched_data(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the most recent saved news data if it was fetched within NEWS_CACHE_TTL.
+        
+        Returns:
+            News data, or None if there is no fresh enough copy
+        """
+        if config.NEWS_CACHE_TTL <= 0:
+            return None
+        
+        recent_file = find_most_recent_date_directory(self.data_dir)
+        if recent_file and time.time() - os.path.getmtime(recent_file) < config.NEWS_CACHE_TTL:
+            return load_json_file(recent_file)
+        return None
     
-    def _handle_online_choice(self) -> Optional[Dict[str, Any]]:
+    def _handle_online_choice(self, use_cache: bool = True,
+                              interactive: bool = True) -> Optional[Dict[str, Any]]:
         """Handle online data choice."""
-        print("🌐 Fetching online data as requested...")
+        # A copy fetched within the last few hours is almost certainly current
+        if use_cache:
+            recent_data = self._load_recently_fetched_data()
+            if recent_data:
+                logger.info("✅ Using recently fetched news data (run with --no-cache to refetch)")
+                return recent_data
+        
+        logger.info("🌐 Fetching online data as requested...")
         news_data = self.fetch_online_news_data()
         if news_data:
             self.save_news_data_locally(news_data)
             return news_data
         else:
-            print("❌ Failed to fetch online data.")
+            logger.error("❌ Failed to fetch online data.")
+            if not interactive or not sys.stdin.isatty():
+                # Take the prompt's default answer without asking
+                logger.info("🔄 Falling back to local data...")
+                return self._try_local_fallback()
+            
+            flush_logging()
             print("💡 Would you like to try local data instead? (y/n)")
             try:
                 fallback_choice = input().strip().lower()
                 if fallback_choice in ['y', 'yes', '']:
-                    print("🔄 Falling back to local data...")
+                    logger.info("🔄 Falling back to local data...")
                     return self._try_local_fallback()
             except KeyboardInterrupt:
                 print("\n🛑 Operation cancelled.")
@@ -214,50 +462,73 @@ class DataService:
     
     def _handle_local_choice(self) -> Optional[Dict[str, Any]]:
         """Handle local data choice."""
-        print("📁 Using local data as requested...")
+        logger.info("📁 Using local data as requested...")
         local_data = self.load_local_news_data()
         if local_data:
             return local_data
         else:
-            print("⚠️ Standard local file not found, trying most recent date directory...")
+            logger.warning("⚠️ Standard local file not found, trying most recent date directory...")
             return self.get_most_recent_local_data()
     
-    def _handle_auto_choice(self) -> Optional[Dict[str, Any]]:
+    def _handle_auto_choice(self, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """Handle auto data choice."""
-        print("🔄 Auto mode: Trying online first...")
+        if use_cache:
+            recent_data = self._load_recently_fetched_data()
+            if recent_data:
+                logger.info("✅ Auto mode: Using recently fetched local data")
+                return recent_data
+        
+        logger.info("🔄 Auto mode: Trying online first...")
         news_data = self.fetch_online_news_data()
         
         if news_data:
             self.save_news_data_locally(news_data)
             return news_data
         else:
-            print("⚠️ Online fetch failed, trying local file...")
+            logger.warning("⚠️ Online fetch failed, trying local file...")
             return self._try_local_fallback()
     
     def _try_local_fallback(self) -> Optional[Dict[str, Any]]:
         """Try local data as fallback."""
         local_data = self.load_local_news_data()
         if local_data:
-            print("✅ Using local data file.")
+            logger.info("✅ Using local data file.")
             return local_data
         else:
-            print("⚠️ Local file failed, trying most recent date directory...")
+            logger.warning("⚠️ Local file failed, trying most recent date directory...")
             recent_data = self.get_most_recent_local_data()
             if recent_data:
-                print("✅ Using most recent date directory data.")
+                logger.info("✅ Using most recent date directory data.")
                 return recent_data
             else:
-                print("❌ All data sources failed.")
+                logger.error("❌ All data sources failed.")
                 return None
 
 
-def get_user_choice_for_data_source() -> str:
+def get_user_choice_for_data_source(preset: Optional[str] = None,
+                                    interactive: bool = True) -> str:
     """
     Get user's preference for data source.
     
+    The menu is skipped when a choice is preset, when prompting is disabled, or
+    when stdin is not a terminal (cron jobs, CI, piped runs).
+    
+    Args:
+        preset: Data source choice ('online', 'local', 'auto') given up front
+        interactive: Whether the user may be prompted for a choice
+    
     Returns:
         User choice string
     """
+    if preset:
+        return preset
+    
+    if not interactive or not sys.stdin.isatty():
+        logger.info("🔄 Non-interactive run: using auto data source")
+        return "auto"
+    
+    # Make sure earlier log output appears before the menu
+    flush_logging()
     print("\n" + "="*50)
     print("DATA SOURCE SELECTION")
     print("="*50)
@@ -12,11 +12,102 @@ except ImportError:
     # Fallback if the new genai client is not available
     google_genai = None
     types = None
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
 import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
 
 from ..utils.config import config
-from ..utils.audio_utils import save_binary_file, convert_to_wav, ensure_wav_extension
+from ..utils.audio_utils import ensure_wav_extension, write_wav_stream
+from ..utils.file_utils import save_text_file
+from ..utils.text_utils import split_text_into_shards
+
+logger = logging.getLogger(__name__)
+
+# Model used for script generation
+_SCRIPT_MODEL_NAME = 'gemini-1.5-flash'
+
+# Script generation model shared by every GeminiService, created on first use
+_SCRIPT_MODEL: Optional["genai.GenerativeModel"] = None
+_SCRIPT_MODEL_LOCK = threading.Lock()
+
+
+def _get_script_model() -> "genai.GenerativeModel":
+    """
+    Get the shared script generation model, creating it on first use.
+    
+    The model picks up the API key from genai.configure when it makes a request.
+    
+    Returns:
+        Gemini generative model for script generation
+    """
+    global _SCRIPT_MODEL
+    with _SCRIPT_MODEL_LOCK:
+        if _SCRIPT_MODEL is None:
+            _SCRIPT_MODEL = genai.GenerativeModel(
+                _SCRIPT_MODEL_NAME,
+                generation_config=genai.types.GenerationConfig(
+                    temperature=0.7,
+                    top_p=0.8,
+                    top_k=40,
+                    max_output_tokens=8192,
+                )
+            )
+    return _SCRIPT_MODEL
+
+
+# Prompt for turning the raw script into the final podcast script
+_SCRIPT_PROMPT_TEMPLATE = '''Transform this raw Arweave ecosystem news content into a professional, engaging podcast script for "Arweave Today". 
+
+Date: {date_str}
+
+Raw Content:
+{raw_content}
+
+Instructions:
+1. Create a natural, conversational flow suitable for audio delivery
+2. Use Puck's enthusiastic but professional tone - friendly tech podcaster style
+3. Add smooth transitions between topics using phrases like "First up", "Moving on", "Next", "And finally"
+4. Explain technical terms in an accessible way for general audiences
+5. Maintain excitement about the Arweave ecosystem and permanent web
+6. Keep the script between 3-5 minutes when spoken (approximately 450-750 words)
+7. End with a warm, professional closing
+
+Voice Guidelines for Puck:
+- Conversational and warm, like talking to a friend
+- Professional but approachable
+- Occasionally uses natural filler words ("you know", "well", "now")
+- Explains complex concepts simply
+- Shows genuine enthusiasm for decentralized technology
+
+Format the output as a clean script without stage directions, music cues, or formatting markers - just the text that should be spoken.'''
+
+# Prompt for structured transcription of an audio file
+_TRANSCRIPTION_PROMPT = """Generate a structured transcript of this audio. Include timestamps and identify speakers.
+
+Expected speakers for Arweave ecosystem content:
+- Host/Presenter (main speaker)
+- Guest/Interviewee (if present)
+
+Format example:
+[00:00] Host: Welcome to today's Arweave update.
+[00:05] Guest: Thanks for having me on the show.
+
+Guidelines:
+- Include timestamps in [MM:SS] format
+- Identify speakers as Host, Guest, or Speaker A/B if names unknown
+- For music or sound effects use: [MM:SS] [MUSIC] or [MM:SS] [SOUND EFFECT]
+- Keep individual segments short and clear
+- End transcript with [END]
+- Use correct spelling and punctuation
+- No markdown formatting (bold/italics)
+- Focus on accuracy and clarity for Arweave/blockchain content
+
+Transcribe the following audio:"""
 
 
 class GeminiService:
@@ -40,10 +131,10 @@ class GeminiService:
             if google_genai is not None:
                 self.client = google_genai.Client(api_key=self.api_key)
             else:
-                print("⚠️ Gemini TTS client not available (google.genai not installed)")
+                logger.warning("⚠️ Gemini TTS client not available (google.genai not installed)")
                 self.client = None
         except Exception as e:
-            print(f"⚠️ Error initializing Gemini client: {e}")
+            logger.warning(f"⚠️ Error initializing Gemini client: {e}")
             self.client = None
     
     def test_connection(self) -> bool:
@@ -54,53 +145,108 @@ class GeminiService:
             True if connection successful, False otherwise
         """
         try:
-            model = genai.GenerativeModel('gemini-1.5-flash')
-            response = model.generate_content("Hello, this is a test.")
+            response = _get_script_model().generate_content("Hello, this is a test.")
             return response and response.text
         except Exception as e:
-            print(f"⚠️ Gemini connection test failed: {e}")
+            logger.warning(f"⚠️ Gemini connection test failed: {e}")
             return False
     
-    def generate_podcast_script(self, raw_content: str, date_str: str) -> str:
+    def generate_podcast_script(self, raw_content: str, date_str: str,
+                                use_cache: bool = True) -> str:
         """
         Generate an enhanced podcast script using Gemini AI.
         
+        Responses are cached on disk by model and prompt for GEMINI_CACHE_TTL
+        seconds, so unchanged content does not trigger another API call.
+        
         Args:
             raw_content: Raw news content to enhance
             date_str: Date string for the podcast
+            use_cache: Reuse a cached response for the same prompt if available
             
         Returns:
             Enhanced podcast script
         """
         try:
-            print("🤖 Generating enhanced podcast script with Gemini AI...")
+            logger.info("🤖 Generating enhanced podcast script with Gemini AI...")
             
             prompt = self._create_script_enhancement_prompt(raw_content, date_str)
+            cache_path = self._get_response_cache_path(_SCRIPT_MODEL_NAME, prompt)
             
-            model = genai.GenerativeModel(
-                'gemini-1.5-flash',
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    top_p=0.8,
-                    top_k=40,
-                    max_output_tokens=8192,
-                )
-            )
+            if use_cache and config.GEMINI_CACHE_TTL > 0:
+                cached_script = self._load_cached_response(cache_path)
+                if cached_script:
+                    logger.info("✅ Reusing cached Gemini AI script for unchanged content")
+                    return cached_script
             
-            response = model.generate_content(prompt)
+            response = _get_script_model().generate_content(prompt)
             
             if response and response.text:
                 enhanced_script = response.text.strip()
-                print("✅ Gemini AI script enhancement completed")
+                if config.GEMINI_CACHE_TTL > 0:
+                    save_text_file(enhanced_script, cache_path)
+                    self._prune_response_cache(os.path.dirname(cache_path))
+                logger.info("✅ Gemini AI script enhancement completed")
                 return enhanced_script
             else:
-                print("⚠️ No response from Gemini AI")
+                logger.warning("⚠️ No response from Gemini AI")
                 return raw_content
                 
         except Exception as e:
-            print(f"⚠️ Error generating script with Gemini AI: {e}")
+            logger.warning(f"⚠️ Error generating script with Gemini AI: {e}")
             return raw_content
     
+    def _get_response_cache_path(self, model_name: str, prompt: str) -> str:
+        """
+        Get the cache file for a model and prompt pair.
+        
+        Args:
+            model_name: Name of the Gemini model
+            prompt: Prompt sent to the model
+            
+        Returns:
+            Path of the cached response file
+        """
+        key = hashlib.sha256(f"{model_name}\0{prompt}".encode('utf-8')).hexdigest()
+        return os.path.join(config.CACHE_DIR, 'gemini', f"{key}.txt")
+    
+    def _load_cached_response(self, cache_path: str) -> Optional[str]:
+        """
+        Load a cached Gemini response written less than GEMINI_CACHE_TTL seconds ago.
+        
+        Args:
+            cache_path: Path of the cached response file
+            
+        Returns:
+            Cached response text, or None if there is no usable cache entry
+        """
+        try:
+            if time.time() - os.path.getmtime(cache_path) >= config.GEMINI_CACHE_TTL:
+                return None
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return f.read() or None
+        except OSError:
+            return None
+    
+    def _prune_response_cache(self, cache_dir: str) -> None:
+        """
+        Delete cached responses older than GEMINI_CACHE_TTL.
+        
+        Args:
+            cache_dir: Directory holding the cached response files
+        """
+        cutoff = time.time() - config.GEMINI_CACHE_TTL
+        try:
+            with os.scandir(cache_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.name.endswith('.txt') and entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"Could not prune Gemini response cache: {e}")
+    
     def _create_script_enhancement_prompt(self, raw_content: str, date_str: str) -> str:
         """
         Create the prompt for script enhancement.
@@ -112,30 +258,7 @@ class GeminiService:
         Returns:
             Formatted prompt string
         """
-        return f'''Transform this raw Arweave ecosystem news content into a professional, engaging podcast script for "Arweave Today". 
-
-Date: {date_str}
-
-Raw Content:
-{raw_content}
-
-Instructions:
-1. Create a natural, conversational flow suitable for audio delivery
-2. Use Puck's enthusiastic but professional tone - friendly tech podcaster style
-3. Add smooth transitions between topics using phrases like "First up", "Moving on", "Next", "And finally"
-4. Explain technical terms in an accessible way for general audiences
-5. Maintain excitement about the Arweave ecosystem and permanent web
-6. Keep the script between 3-5 minutes when spoken (approximately 450-750 words)
-7. End with a warm, professional closing
-
-Voice Guidelines for Puck:
-- Conversational and warm, like talking to a friend
-- Professional but approachable
-- Occasionally uses natural filler words ("you know", "well", "now")
-- Explains complex concepts simply
-- Shows genuine enthusiasm for decentralized technology
-
-Format the output as a clean script without stage directions, music cues, or formatting markers - just the text that should be spoken.'''
+        return _SCRIPT_PROMPT_TEMPLATE.format(date_str=date_str, raw_content=raw_content)
     
     def generate_audio(self, script_text: str, output_path: str) -> bool:
         """
@@ -149,81 +272,113 @@ Format the output as a clean script without stage directions, music cues, or for
             True if successful, False otherwise
         """
         try:
-            print("🎤 Generating podcast audio with Gemini TTS (Puck voice)...")
+            logger.info("🎤 Generating podcast audio with Gemini TTS (Puck voice)...")
             
             if not self.client:
-                print("⚠️ Gemini client not initialized")
+                logger.warning("⚠️ Gemini client not initialized")
                 return False
             
             if types is None:
-                print("⚠️ Gemini TTS types not available (google.genai not properly installed)")
+                logger.warning("⚠️ Gemini TTS types not available (google.genai not properly installed)")
                 return False
             
-            model = "gemini-2.5-flash-preview-tts"
+            if config.ENABLE_PARALLEL_TTS:
+                shards = split_text_into_shards(script_text, config.TTS_SENTENCES_PER_SHARD)
+            else:
+                shards = [script_text]
             
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[
-                        types.Part.from_text(text=script_text),
-                    ],
-                ),
-            ]
+            # Ensure output path has .wav extension for Gemini TTS
+            output_path = ensure_wav_extension(output_path)
             
-            generate_content_config = types.GenerateContentConfig(
-                temperature=1,
-                response_modalities=["audio"],
-                speech_config=types.SpeechConfig(
-                    voice_config=types.VoiceConfig(
-                        prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                            voice_name="Puck"
-                        )
-                    ),
-                ),
-            )
-
-            audio_chunks = []
-            for chunk in self.client.models.generate_content_stream(
-                model=model,
-                contents=contents,
-                config=generate_content_config,
-            ):
-                if (
-                    chunk.candidates is None
-                    or chunk.candidates[0].content is None
-                    or chunk.candidates[0].content.parts is None
-                ):
-                    continue
-                
-                if (chunk.candidates[0].content.parts[0].inline_data and 
-                    chunk.candidates[0].content.parts[0].inline_data.data):
-                    inline_data = chunk.candidates[0].content.parts[0].inline_data
-                    data_buffer = inline_data.data
-                    
-                    # Convert to WAV if needed
-                    if inline_data.mime_type != "audio/wav":
-                        data_buffer = convert_to_wav(inline_data.data, inline_data.mime_type)
-                    
-                    audio_chunks.append(data_buffer)
+            # Audio is written to disk as it arrives rather than buffered in memory
+            if len(shards) > 1:
+                logger.info(f"⚡ Synthesizing {len(shards)} script shards in parallel...")
+                max_workers = max(1, min(config.TTS_MAX_WORKERS, len(shards)))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    # map yields shards in script order as soon as each is ready
+                    data_size = write_wav_stream(output_path,
+                                                 executor.map(self._synthesize_pcm, shards))
+            else:
+                data_size = write_wav_stream(output_path, self._stream_audio(script_text))
             
-            if audio_chunks:
-                # Combine all audio chunks
-                combined_audio = b''.join(audio_chunks)
-                
-                # Ensure output path has .wav extension for Gemini TTS
-                output_path = ensure_wav_extension(output_path)
-                
-                save_binary_file(output_path, combined_audio)
-                print(f"✅ Gemini TTS audio generated: {output_path}")
+            if data_size:
+                logger.info(f"✅ Gemini TTS audio generated: {output_path}")
                 return True
             else:
-                print("⚠️ No audio data received from Gemini TTS")
+                logger.warning("⚠️ No audio data received from Gemini TTS")
                 return False
                 
         except Exception as e:
-            print(f"⚠️ Error generating audio with Gemini TTS: {e}")
+            logger.warning(f"⚠️ Error generating audio with Gemini TTS: {e}")
             return False
     
+    def _synthesize_pcm(self, text: str) -> Tuple[bytes, Optional[str]]:
+        """
+        Synthesize speech for a piece of text in full.
+        
+        Args:
+            text: Text to convert to audio
+            
+        Returns:
+            Tuple of the raw audio bytes and their MIME type (None if no audio)
+        """
+        audio_chunks = []
+        mime_type = None
+        for data, chunk_mime_type in self._stream_audio(text):
+            mime_type = mime_type or chunk_mime_type
+            audio_chunks.append(data)
+        return b''.join(audio_chunks), mime_type
+    
+    def _stream_audio(self, text: str) -> Iterator[Tuple[bytes, Optional[str]]]:
+        """
+        Stream speech for a piece of text from Gemini TTS.
+        
+        Args:
+            text: Text to convert to audio
+            
+        Yields:
+            Tuples of raw audio bytes and their MIME type
+        """
+        model = "gemini-2.5-flash-preview-tts"
+        
+        contents = [
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part.from_text(text=text),
+                ],
+            ),
+        ]
+        
+        generate_content_config = types.GenerateContentConfig(
+            temperature=1,
+            response_modalities=["audio"],
+            speech_config=types.SpeechConfig(
+                voice_config=types.VoiceConfig(
+                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                        voice_name="Puck"
+                    )
+                ),
+            ),
+        )
+
+        for chunk in self.client.models.generate_content_stream(
+            model=model,
+            contents=contents,
+            config=generate_content_config,
+        ):
+            if (
+                chunk.candidates is None
+                or chunk.candidates[0].content is None
+                or chunk.candidates[0].content.parts is None
+            ):
+                continue
+            
+            if (chunk.candidates[0].content.parts[0].inline_data and 
+                chunk.candidates[0].content.parts[0].inline_data.data):
+                inline_data = chunk.candidates[0].content.parts[0].inline_data
+                yield inline_data.data, inline_data.mime_type
+    
     def transcribe_audio_file(self, file_path: str) -> str:
         """
         Transcribe an audio file using Gemini AI with structured speaker diarization.
@@ -235,10 +390,10 @@ Format the output as a clean script without stage directions, music cues, or for
             Structured transcription text with timestamps and speaker identification
         """
         try:
-            print("🎧 Transcribing audio file with Gemini AI (structured format)...")
+            logger.info("🎧 Transcribing audio file with Gemini AI (structured format)...")
             
             if not self.client:
-                print("⚠️ Gemini client not initialized")
+                logger.warning("⚠️ Gemini client not initialized")
                 return ""
             
             model = "gemini-2.5-flash"
@@ -247,34 +402,11 @@ Format the output as a clean script without stage directions, music cues, or for
             with open(file_path, "rb") as audio_file:
                 audio_data = audio_file.read()
             
-            # Create structured transcription prompt
-            transcription_prompt = """Generate a structured transcript of this audio. Include timestamps and identify speakers.
-
-Expected speakers for Arweave ecosystem content:
-- Host/Presenter (main speaker)
-- Guest/Interviewee (if present)
-
-Format example:
-[00:00] Host: Welcome to today's Arweave update.
-[00:05] Guest: Thanks for having me on the show.
-
-Guidelines:
-- Include timestamps in [MM:SS] format
-- Identify speakers as Host, Guest, or Speaker A/B if names unknown
-- For music or sound effects use: [MM:SS] [MUSIC] or [MM:SS] [SOUND EFFECT]
-- Keep individual segments short and clear
-- End transcript with [END]
-- Use correct spelling and punctuation
-- No markdown formatting (bold/italics)
-- Focus on accuracy and clarity for Arweave/blockchain content
-
-Transcribe the following audio:"""
-            
             contents = [
                 types.Content(
                     role="user",
                     parts=[
-                        types.Part.from_text(text=transcription_prompt),
+                        types.Part.from_text(text=_TRANSCRIPTION_PROMPT),
                         types.Part.from_audio(data=audio_data, mime_type="audio/mpeg"),
                     ],
                 ),
@@ -287,14 +419,14 @@ Transcribe the following audio:"""
             
             if response and response.text:
                 transcription = response.text.strip()
-                print("✅ Structured audio transcription completed")
+                logger.info("✅ Structured audio transcription completed")
                 return transcription
             else:
-                print("⚠️ No transcription response from Gemini AI")
+                logger.warning("⚠️ No transcription response from Gemini AI")
                 return ""
                 
         except Exception as e:
-            print(f"⚠️ Error transcribing audio file with Gemini AI: {e}")
+            logger.warning(f"⚠️ Error transcribing audio file with Gemini AI: {e}")
             return ""
 
 
@@ -307,7 +439,7 @@ def create_gemini_service() -> Optional[GeminiService]:
         GeminiService instance or None if not configured
     """
     if not config.is_gemini_configured():
-        print("⚠️ Gemini API key not configured")
+        logger.warning("⚠️ Gemini API key not configured")
         return None
     
     return GeminiService(config.GEMINI_API_KEY)
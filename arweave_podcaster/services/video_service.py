@@ -5,41 +5,126 @@ This module handles video downloading from URLs and transcription using Whisper
 """
 
 import os
-import yt_dlp
-from faster_whisper import WhisperModel
-from datetime import datetime
-from typing import Optional
+import hashlib
+import logging
+import threading
+from typing import TYPE_CHECKING, Optional
 
 from ..utils.config import config
-from ..utils.file_utils import save_text_file, load_text_file, ensure_directory_exists
+from ..utils.file_utils import save_text_file, ensure_directory_exists
+from ..utils.http_utils import get_http_session
+
+# yt_dlp, faster_whisper and numpy are imported where they are used: they are
+# slow to import and only needed when a topic actually has a video
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
+logger = logging.getLogger(__name__)
+
+# Whisper works on 16 kHz mono audio
+WHISPER_SAMPLE_RATE = 16000
+
+# Clips shorter or quieter than this are not worth a Whisper pass
+MIN_AUDIO_SECONDS = 2.0
+MIN_AUDIO_RMS = 1e-3
+
+# Saved transcripts starting with this mark a failed attempt
+FAILED_TRANSCRIPT_MARKER = b"[TRANSCRIPTION FAILED"
+# Saved transcript of a video without speech; reused like any other transcript
+NO_SPEECH_TRANSCRIPT_MARKER = b"[NO SPEECH]"
+
+# One Whisper model per process, shared by every VideoService instance
+_WHISPER_MODEL: Optional["WhisperModel"] = None
+_WHISPER_MODEL_LOCK = threading.Lock()
+_TRANSCRIBE_LOCK = threading.Lock()
+_BATCHED_PIPELINE = None
+
+# Passed to faster-whisper's VAD: silences at least this long split speech
+_VAD_PARAMETERS = {"min_silence_duration_ms": 500}
+
+
+def _get_whisper_model() -> "WhisperModel":
+    """
+    Get the shared Whisper model, loading it on first use.
+    
+    Returns:
+        WhisperModel instance
+    """
+    global _WHISPER_MODEL
+    with _WHISPER_MODEL_LOCK:
+        if _WHISPER_MODEL is None:
+            from faster_whisper import WhisperModel
+            
+            device = config.WHISPER_DEVICE
+            if device == 'auto':
+                import ctranslate2
+                
+                # Prefer a CUDA GPU when one is visible to CTranslate2
+                device = 'cuda' if ctranslate2.get_cuda_device_count() > 0 else 'cpu'
+            compute_type = config.WHISPER_COMPUTE_TYPE or (
+                'int8_float16' if device == 'cuda' else 'int8')
+            model_options = dict(
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=config.WHISPER_CPU_THREADS or os.cpu_count() or 0,
+                num_workers=1,
+            )
+            if config.WHISPER_MODEL_PATH:
+                # Pre-converted, pre-quantised CTranslate2 model directory
+                logger.info(f"📥 Loading Whisper model from: {config.WHISPER_MODEL_PATH} "
+                            f"({device}, {compute_type})")
+                _WHISPER_MODEL = WhisperModel(config.WHISPER_MODEL_PATH, **model_options)
+            else:
+                logger.info(f"📥 Loading Whisper model: {config.WHISPER_MODEL} "
+                            f"({device}, {compute_type})")
+                _WHISPER_MODEL = WhisperModel(config.WHISPER_MODEL,
+                                              download_root=config.WHISPER_CACHE_DIR,
+                                              **model_options)
+    return _WHISPER_MODEL
+
+
+def _get_batched_pipeline():
+    """
+    Get a batched inference pipeline over the shared Whisper model.
+    
+    Returns:
+        BatchedInferencePipeline, or None if batching is disabled or not
+        supported by the installed faster-whisper
+    """
+    global _BATCHED_PIPELINE
+    if config.WHISPER_BATCH_SIZE <= 0:
+        return None
+    
+    model = _get_whisper_model()
+    with _WHISPER_MODEL_LOCK:
+        if _BATCHED_PIPELINE is None:
+            try:
+                from faster_whisper import BatchedInferencePipeline
+            except ImportError:
+                logger.warning("⚠️ Installed faster-whisper has no BatchedInferencePipeline, "
+                               "transcribing without batching")
+                _BATCHED_PIPELINE = False
+            else:
+                _BATCHED_PIPELINE = BatchedInferencePipeline(model=model)
+    return _BATCHED_PIPELINE or None
 
 
 class VideoService:
     """Service for video downloading and transcription."""
     
-    def __init__(self, output_dir: str):
+    def __init__(self, output_dir: str, cache_dir: Optional[str] = None):
         """
         Initialize the video service.
         
         Args:
             output_dir: Directory for saving transcripts and temporary files
+            cache_dir: Transcript cache directory, shareable across output
+                directories (defaults to one inside output_dir)
         """
         self.output_dir = output_dir
-        self.whisper_model = None
+        self.cache_dir = cache_dir or os.path.join(output_dir, '.transcript_cache')
         ensure_directory_exists(output_dir)
     
-    def _get_whisper_model(self) -> WhisperModel:
-        """
-        Get or initialize the Whisper model.
-        
-        Returns:
-            WhisperModel instance
-        """
-        if self.whisper_model is None:
-            print(f"📥 Loading Whisper model: {config.WHISPER_MODEL}")
-            self.whisper_model = WhisperModel(config.WHISPER_MODEL)
-        return self.whisper_model
-    
     def transcribe_video(self, video_url: str, topic_identifier: Optional[str] = None) -> str:
         """
         Download audio from video URL and transcribe it using Whisper.
@@ -49,32 +134,38 @@ class VideoService:
             topic_identifier: Identifier for the topic (e.g., "topic_1")
             
         Returns:
-            Transcribed text, or empty string if failed
+            Transcribed text, or empty string if failed or the video has no speech
         """
         try:
-            print(f"\nAttempting to transcribe video: {video_url}")
-            
-            # Generate filename
-            if topic_identifier:
-                temp_audio_filename = f"{topic_identifier}_video"
-            else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                temp_audio_filename = f"temp_audio_{timestamp}"
-            
-            # Check if transcript already exists
-            transcript_filename = f"{temp_audio_filename}_transcript.txt"
+            logger.info(f"Attempting to transcribe video: {video_url}")
+            
+            # Key cached transcripts on the video URL so the same video is reused
+            # across topics and runs
+            url_hash = hashlib.sha256(video_url.encode()).hexdigest()[:16]
+            base_name = f"{topic_identifier}_{url_hash}" if topic_identifier else url_hash
+            temp_audio_filename = f"{base_name}_video"
+            transcript_filename = f"{base_name}_transcript.txt"
             transcript_path = os.path.join(self.output_dir, transcript_filename)
+            cache_path = os.path.join(self.cache_dir, f"{url_hash}.txt")
             
-            if os.path.exists(transcript_path):
-                print(f"📄 Transcript file already exists: {transcript_filename}")
-                print("⏭️  Skipping video download and transcription...")
+            # Check the shared cache first, then the per-topic transcript
+            for existing_path in (cache_path, transcript_path):
+                try:
+                    existing_size = os.stat(existing_path).st_size
+                except OSError:
+                    continue
                 
-                existing_content = load_text_file(transcript_path)
-                if existing_content and not existing_content.startswith("[TRANSCRIPTION FAILED"):
-                    print("✅ Using existing transcript")
+                logger.debug(f"📄 Transcript file already exists: {os.path.basename(existing_path)}")
+                existing_content = self._load_transcript(existing_path) if existing_size else None
+                if existing_content is not None:
+                    logger.debug("⏭️  Skipping video download and transcription...")
+                    logger.info("✅ Using existing transcript" if existing_content
+                                else "✅ Video previously found to have no speech")
+                    if not os.path.exists(transcript_path):
+                        self._save_transcript(existing_content, transcript_path)
                     return existing_content
                 else:
-                    print("⚠️  Existing transcript appears to be empty or failed, re-processing...")
+                    logger.warning("⚠️  Existing transcript appears to be empty or failed, re-processing...")
             
             # Download and transcribe
             temp_audio_path_base = os.path.join(self.output_dir, temp_audio_filename)
@@ -88,20 +179,21 @@ class VideoService:
             # Clean up temporary audio file
             try:
                 os.remove(audio_path)
-                print(f"🗑️  Cleaned up temporary audio file")
+                logger.debug(f"🗑️  Cleaned up temporary audio file")
             except Exception as e:
-                print(f"⚠️  Could not remove temporary file: {e}")
+                logger.warning(f"⚠️  Could not remove temporary file: {e}")
             
-            # Save transcript
-            if transcript_text:
-                save_text_file(transcript_text, transcript_path)
-                print(f"📄 Video transcript saved: {transcript_filename}")
+            # Save transcript (an empty one is kept too, so silent clips are not re-processed)
+            if transcript_text is not None:
+                self._save_transcript(transcript_text, transcript_path)
+                self._save_transcript(transcript_text, cache_path)
+                logger.info(f"📄 Video transcript saved: {transcript_filename}")
                 return transcript_text
             else:
                 return self._save_failed_transcript(transcript_path, "Transcription failed")
                 
         except Exception as e:
-            print(f"⚠️ Error transcribing video {video_url}: {e}")
+            logger.warning(f"⚠️ Error transcribing video {video_url}: {e}")
             if 'transcript_path' in locals():
                 return self._save_failed_transcript(transcript_path, f"Error: {e}")
             return ""
@@ -119,13 +211,12 @@ class VideoService:
         """
         try:
             ydl_opts = {
-                'format': 'bestaudio/best',
+                # Keep the native audio stream: Whisper decodes and resamples it
+                # itself, so there is nothing to gain from an FFmpeg re-encode
+                'format': 'bestaudio[ext=m4a]/bestaudio/best',
                 'outtmpl': f'{output_path_base}.%(ext)s',
                 'quiet': True,
                 'no_warnings': True,
-                'extractaudio': True,
-                'audioformat': 'wav',
-                'audioquality': 0,
                 'socket_timeout': 30,
                 'retries': 3,
                 'fragment_retries': 3,
@@ -135,38 +226,40 @@ class VideoService:
             if config.FFMPEG_PATH:
                 ydl_opts['ffmpeg_location'] = config.FFMPEG_PATH
             
-            print(f"📥 Downloading audio from video...")
-            print(f"🔗 URL: {video_url}")
+            logger.info(f"📥 Downloading audio from video...")
+            logger.debug(f"🔗 URL: {video_url}")
             
             # Special handling for Twitter/X videos
             if 'twimg.com' in video_url or 'twitter.com' in video_url or 'x.com' in video_url:
-                print("🐦 Detected Twitter/X video - using direct download")
+                logger.info("🐦 Detected Twitter/X video - using direct download")
                 return self._download_direct_video(video_url, output_path_base)
             
+            import yt_dlp
+            
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(video_url, download=True)
                 
-                # Find the downloaded file
-                for ext in ['wav', 'mp3', 'm4a', 'webm']:
-                    potential_path = f"{output_path_base}.{ext}"
-                    if os.path.exists(potential_path):
-                        print(f"✅ Audio downloaded: {os.path.basename(potential_path)}")
-                        return potential_path
+                # yt-dlp reports where it wrote the file
+                downloads = (info or {}).get('requested_downloads') or [{}]
+                audio_path = downloads[0].get('filepath')
+                if audio_path and os.path.exists(audio_path):
+                    logger.info(f"✅ Audio downloaded: {os.path.basename(audio_path)}")
+                    return audio_path
                 
-                print("⚠️ Downloaded file not found")
+                logger.warning("⚠️ Downloaded file not found")
                 return None
                 
         except Exception as e:
-            print(f"⚠️ Error downloading audio: {e}")
+            logger.warning(f"⚠️ Error downloading audio: {e}")
             # Try direct download as fallback
             if 'twimg.com' in video_url:
-                print("🔄 Trying direct download as fallback...")
+                logger.info("🔄 Trying direct download as fallback...")
                 return self._download_direct_video(video_url, output_path_base)
             return None
     
     def _download_direct_video(self, video_url: str, output_path_base: str) -> Optional[str]:
         """
-        Download video directly using requests for Twitter/X videos.
+        Download video directly over HTTP for Twitter/X videos.
         
         Args:
             video_url: Direct video URL
@@ -176,14 +269,12 @@ class VideoService:
             Path to downloaded video file, or None if failed
         """
         try:
-            import requests
-            
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            print("📥 Attempting direct video download...")
-            response = requests.get(video_url, headers=headers, timeout=30, stream=True)
+            logger.info("📥 Attempting direct video download...")
+            response = get_http_session().get(video_url, headers=headers, timeout=30, stream=True)
             response.raise_for_status()
             
             # Determine file extension from URL or content type
@@ -202,102 +293,115 @@ class VideoService:
                     if chunk:
                         f.write(chunk)
             
-            print(f"✅ Video downloaded: {os.path.basename(video_path)}")
+            logger.info(f"✅ Video downloaded: {os.path.basename(video_path)}")
             
-            # Extract audio using FFmpeg directly
-            audio_path = f"{output_path_base}.wav"
-            return self._extract_audio_with_ffmpeg(video_path, audio_path)
+            # Whisper decodes the audio track straight from the container
+            return video_path
             
         except Exception as e:
-            print(f"⚠️ Direct download failed: {e}")
+            logger.warning(f"⚠️ Direct download failed: {e}")
             return None
     
-    def _extract_audio_with_ffmpeg(self, video_path: str, audio_path: str) -> Optional[str]:
+    def _transcribe_audio(self, audio_path: str) -> Optional[str]:
         """
-        Extract audio from video using FFmpeg.
+        Transcribe audio file using Whisper.
         
         Args:
-            video_path: Path to video file
-            audio_path: Path for output audio file
+            audio_path: Path to audio file
             
         Returns:
-            Path to audio file if successful, None otherwise
+            Transcribed text, an empty string if the audio has no speech, or None
+            if transcription failed
         """
+        import numpy as np
+        from faster_whisper.audio import decode_audio
+        
         try:
-            import subprocess
-            
-            # FFmpeg command to extract audio
-            cmd = [
-                'ffmpeg',
-                '-i', video_path,
-                '-vn',  # No video
-                '-acodec', 'pcm_s16le',  # PCM 16-bit
-                '-ar', '16000',  # Sample rate
-                '-ac', '1',  # Mono
-                '-y',  # Overwrite output file
-                audio_path
-            ]
+            logger.info(f"🎤 Transcribing audio with Whisper ({config.WHISPER_MODEL})...")
             
-            print("🎵 Extracting audio with FFmpeg...")
-            
-            # Run FFmpeg
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            # Decode once: used for the silence check and handed straight to Whisper
+            audio = decode_audio(audio_path, sampling_rate=WHISPER_SAMPLE_RATE)
+            duration = len(audio) / WHISPER_SAMPLE_RATE
+            if duration < MIN_AUDIO_SECONDS or float(np.sqrt(np.mean(audio ** 2))) < MIN_AUDIO_RMS:
+                logger.info(f"🔇 Audio is too short or silent ({duration:.1f}s), skipping transcription")
+                return ""
             
-            if result.returncode == 0 and os.path.exists(audio_path):
-                print(f"✅ Audio extracted: {os.path.basename(audio_path)}")
-                
-                # Clean up video file
-                try:
-                    os.remove(video_path)
-                    print("🗑️ Cleaned up video file")
-                except:
-                    pass
+            model = _get_whisper_model()
+            pipeline = _get_batched_pipeline()
+            # The model runs with a single worker, so topics transcribed in parallel
+            # take turns here (segments are decoded lazily while being joined)
+            with _TRANSCRIBE_LOCK:
+                if pipeline:
+                    # VAD-split chunks of the audio go through the encoder in batches
+                    segments, info = pipeline.transcribe(
+                        audio,
+                        language="en",
+                        beam_size=1,
+                        vad_parameters=_VAD_PARAMETERS,
+                        batch_size=config.WHISPER_BATCH_SIZE,
+                    )
+                else:
+                    # Greedy decoding is enough for a transcript Gemini rewrites anyway; the
+                    # VAD filter drops silence before decoding, and not conditioning on
+                    # previous text keeps the context from growing over long videos
+                    segments, info = model.transcribe(
+                        audio,
+                        language="en",
+                        beam_size=1,
+                        vad_filter=True,
+                        vad_parameters=_VAD_PARAMETERS,
+                        condition_on_previous_text=False,
+                    )
                 
-                return audio_path
+                transcript_text = ' '.join([segment.text.strip() for segment in segments])
+            
+            if transcript_text.strip():
+                logger.info(f"✅ Transcription completed ({len(transcript_text)} characters)")
+                return transcript_text.strip()
             else:
-                print(f"⚠️ FFmpeg failed: {result.stderr}")
-                return None
+                logger.info("🔇 No speech found in audio")
+                return ""
                 
-        except subprocess.TimeoutExpired:
-            print("⚠️ FFmpeg timeout")
-            return None
         except Exception as e:
-            print(f"⚠️ FFmpeg error: {e}")
+            logger.warning(f"⚠️ Error during transcription: {e}")
             return None
     
-    def _transcribe_audio(self, audio_path: str) -> str:
+    def _load_transcript(self, transcript_path: str) -> Optional[str]:
         """
-        Transcribe audio file using Whisper.
+        Load a saved transcript unless it is a failure marker.
+        
+        Only the first bytes are read to recognise a failure marker; the rest of
+        the file is read and decoded only for a usable transcript.
         
         Args:
-            audio_path: Path to audio file
+            transcript_path: Path to the transcript file
             
         Returns:
-            Transcribed text
+            Transcript text ('' for a video without speech), or None if the file
+            is a failure marker or unreadable
         """
         try:
-            print(f"🎤 Transcribing audio with Whisper ({config.WHISPER_MODEL})...")
-            
-            model = self._get_whisper_model()
-            segments, info = model.transcribe(audio_path, language="en")
-            
-            transcript_text = ' '.join([segment.text.strip() for segment in segments])
-            
-            if transcript_text.strip():
-                print(f"✅ Transcription completed ({len(transcript_text)} characters)")
-                return transcript_text.strip()
-            else:
-                print("⚠️ Transcription resulted in empty text")
+            with open(transcript_path, 'rb') as f:
+                head = f.read(len(FAILED_TRANSCRIPT_MARKER))
+                if head == FAILED_TRANSCRIPT_MARKER:
+                    return None
+                content = head + f.read()
+            if content == NO_SPEECH_TRANSCRIPT_MARKER:
                 return ""
-                
-        except Exception as e:
-            print(f"⚠️ Error during transcription: {e}")
-            return ""
+            return content.decode('utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"⚠️ Error loading transcript {transcript_path}: {e}")
+            return None
+    
+    def _save_transcript(self, transcript_text: str, transcript_path: str) -> None:
+        """
+        Save a transcript, writing the no-speech marker for an empty one.
+        
+        Args:
+            transcript_text: Transcribed text (may be empty)
+            transcript_path: Path to save the transcript
+        """
+        save_text_file(transcript_text or NO_SPEECH_TRANSCRIPT_MARKER.decode(), transcript_path)
     
     def _save_failed_transcript(self, transcript_path: str, error_message: str) -> str:
         """
@@ -310,20 +414,21 @@ class VideoService:
         Returns:
             Empty string
         """
-        failed_content = f"[TRANSCRIPTION FAILED: {error_message}]"
+        failed_content = f"{FAILED_TRANSCRIPT_MARKER.decode()}: {error_message}]"
         save_text_file(failed_content, transcript_path)
         return ""
 
 
 # Factory function
-def create_video_service(output_dir: str) -> VideoService:
+def create_video_service(output_dir: str, cache_dir: Optional[str] = None) -> VideoService:
     """
     Create a video service instance.
     
     Args:
         output_dir: Directory for output files
+        cache_dir: Transcript cache directory shared across runs
         
     Returns:
         VideoService instance
     """
-    return VideoService(output_dir)
+    return VideoService(output_dir, cache_dir)
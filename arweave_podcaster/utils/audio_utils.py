@@ -4,10 +4,21 @@ Audio processing utilities for Arweave Podcaster.
 This module contains functions for audio conversion, TTS processing, and audio file management.
 """
 
+import logging
 import struct
-from typing import Dict, Union
+import tempfile
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple, Union
 import os
 
+from .file_utils import _new_file_mode
+
+logger = logging.getLogger(__name__)
+
+# Canonical 44-byte PCM WAV header, see http://soundfile.sapp.org/doc/WaveFormat/
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+WAV_HEADER_SIZE = _WAV_HEADER.size
+
 
 def save_binary_file(file_name: str, data: bytes) -> None:
     """Save binary audio data to file.
@@ -18,7 +29,7 @@ def save_binary_file(file_name: str, data: bytes) -> None:
     """
     with open(file_name, "wb") as f:
         f.write(data)
-    print(f"Audio file saved to: {file_name}")
+    logger.debug(f"Audio file saved to: {file_name}")
 
 
 def convert_to_wav(audio_data: bytes, mime_type: str) -> bytes:
@@ -31,19 +42,29 @@ def convert_to_wav(audio_data: bytes, mime_type: str) -> bytes:
     Returns:
         A bytes object representing the complete WAV file.
     """
+    return create_wav_header(len(audio_data), mime_type) + audio_data
+
+
+def create_wav_header(data_size: int, mime_type: str) -> bytes:
+    """Builds the 44-byte WAV header for raw PCM data.
+
+    Args:
+        data_size: Size of the raw audio data in bytes.
+        mime_type: Mime type of the audio data.
+
+    Returns:
+        The WAV header as a bytes object.
+    """
     parameters = parse_audio_mime_type(mime_type)
     bits_per_sample = parameters["bits_per_sample"]
     sample_rate = parameters["rate"]
     num_channels = 1
-    data_size = len(audio_data)
     bytes_per_sample = bits_per_sample // 8
     block_align = num_channels * bytes_per_sample
     byte_rate = sample_rate * block_align
     chunk_size = 36 + data_size  # 36 bytes for header fields before data chunk size
 
-    # http://soundfile.sapp.org/doc/WaveFormat/
-    header = struct.pack(
-        "<4sI4s4sIHHIIHH4sI",
+    return _WAV_HEADER.pack(
         b"RIFF",          # ChunkID
         chunk_size,       # ChunkSize (total file size - 8 bytes)
         b"WAVE",          # Format
@@ -58,13 +79,64 @@ def convert_to_wav(audio_data: bytes, mime_type: str) -> bytes:
         b"data",          # Subchunk2ID
         data_size         # Subchunk2Size (size of audio data)
     )
-    return header + audio_data
 
 
+def write_wav_stream(file_name: str, chunks: Iterable[Tuple[bytes, Optional[str]]]) -> int:
+    """Write streamed audio chunks to a WAV file as they arrive.
+
+    Raw PCM is written after a placeholder header, which is replaced with the
+    real one once the total size is known. Audio that already arrives as
+    audio/wav is written unchanged. Chunks go to a temporary file next to the
+    target, which only replaces it once the stream completes, so a failed or
+    empty stream leaves an existing file untouched.
+
+    Args:
+        file_name: Path where to save the audio file
+        chunks: Iterable of (audio data, mime type) pairs
+
+    Returns:
+        Number of audio bytes written; 0 means no audio and the file is not written
+    """
+    mime_type = None
+    data_size = 0
+    stem, extension = os.path.splitext(os.path.basename(file_name))
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_name) or '.',
+                                    prefix=f".{stem}-", suffix=extension)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for data, chunk_mime_type in chunks:
+                if not data:
+                    continue
+                if mime_type is None:
+                    mime_type = chunk_mime_type or ""
+                    if mime_type != "audio/wav":
+                        f.write(b"\0" * WAV_HEADER_SIZE)
+                f.write(data)
+                data_size += len(data)
+            
+            if data_size and mime_type != "audio/wav":
+                f.seek(0)
+                f.write(create_wav_header(data_size, mime_type))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        if data_size:
+            os.chmod(tmp_path, _new_file_mode(file_name))
+            os.replace(tmp_path, file_name)
+            logger.debug(f"Audio file saved to: {file_name}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return data_size
+
+
+@lru_cache(maxsize=8)
 def parse_audio_mime_type(mime_type: str) -> Dict[str, int]:
     """Parses bits per sample and rate from an audio MIME type string.
 
     Assumes bits per sample is encoded like "L16" and rate as "rate=xxxxx".
+    Results are cached (Gemini sends the same MIME type for a whole stream), so
+    the returned dictionary must not be modified.
 
     Args:
         mime_type: The audio MIME type string (e.g., "audio/L16;rate=24000").
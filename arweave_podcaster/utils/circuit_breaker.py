@@ -0,0 +1,78 @@
+"""
+Circuit breaker for Arweave Podcaster.
+
+This module contains a small circuit breaker whose state is persisted to disk so
+that repeated failures of an external dependency are remembered across runs.
+"""
+
+import os
+import time
+from typing import Any, Dict
+
+from .file_utils import load_json_file, save_json_file
+
+
+class CircuitBreaker:
+    """Persisted CLOSED -> OPEN -> HALF_OPEN circuit breaker."""
+
+    CLOSED = 'CLOSED'
+    OPEN = 'OPEN'
+    HALF_OPEN = 'HALF_OPEN'
+
+    def __init__(self, state_path: str, failure_threshold: int = 3,
+                 reset_timeout: float = 300.0):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            state_path: JSON file used to persist the breaker state
+            failure_threshold: Consecutive failures before the circuit opens
+            reset_timeout: Seconds to stay open before allowing a probe request
+        """
+        self.state_path = state_path
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call should be attempted.
+
+        Returns:
+            False while the circuit is open, True otherwise
+        """
+        state = self._load_state()
+        if state['state'] == self.OPEN:
+            if time.time() - state['opened_at'] < self.reset_timeout:
+                return False
+            # Probe window reached: let one request through
+            state['state'] = self.HALF_OPEN
+            self._save_state(state)
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        state = self._load_state()
+        if state['state'] != self.CLOSED or state['failures']:
+            self._save_state({'state': self.CLOSED, 'failures': 0, 'opened_at': 0.0})
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit when the threshold is reached."""
+        state = self._load_state()
+        state['failures'] += 1
+        if state['state'] == self.HALF_OPEN or state['failures'] >= self.failure_threshold:
+            state['state'] = self.OPEN
+            state['opened_at'] = time.time()
+        self._save_state(state)
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Load the persisted state, defaulting to a closed circuit."""
+        state = {'state': self.CLOSED, 'failures': 0, 'opened_at': 0.0}
+        if os.path.exists(self.state_path):
+            saved = load_json_file(self.state_path)
+            if isinstance(saved, dict):
+                state.update(saved)
+        return state
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        """Persist the breaker state."""
+        save_json_file(state, self.state_path)
@@ -8,27 +8,72 @@ import os
 from dotenv import load_dotenv
 from typing import Optional
 
+# Project root, resolved once at import time
+PROJECT_ROOT: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Load environment variables from .env file
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
+load_dotenv(dotenv_path=os.path.join(PROJECT_ROOT, '.env'))
 
 
 class Config:
     """Configuration class for managing application settings."""
     
+    # Cache directory for state kept between runs
+    CACHE_DIR: str = (os.getenv('ARWEAVE_PODCASTER_CACHE_DIR')
+                      or os.path.expanduser('~/.cache/arweave-podcaster'))
+    
+    # Logging configuration
+    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO').upper()
+    
     # FFmpeg configuration
     FFMPEG_PATH: str = os.getenv('FFMPEG_PATH', '')
     
     # Whisper model configuration
     WHISPER_MODEL: str = os.getenv('WHISPER_MODEL', 'tiny.en')
+    WHISPER_MODEL_PATH: str = os.getenv('WHISPER_MODEL_PATH', '')
+    WHISPER_CACHE_DIR: str = (os.getenv('WHISPER_CACHE_DIR')
+                              or os.path.expanduser('~/.cache/faster-whisper'))
+    # Inference device ('auto', 'cpu' or 'cuda'); compute type defaults to int8 on
+    # CPU and int8_float16 on CUDA; 0 CPU threads means one per core
+    WHISPER_DEVICE: str = os.getenv('WHISPER_DEVICE', 'auto').lower()
+    WHISPER_COMPUTE_TYPE: str = os.getenv('WHISPER_COMPUTE_TYPE', '')
+    WHISPER_CPU_THREADS: int = int(os.getenv('WHISPER_CPU_THREADS') or '0')
+    # Batch size for faster-whisper's batched pipeline (0 transcribes without batching)
+    WHISPER_BATCH_SIZE: int = int(os.getenv('WHISPER_BATCH_SIZE') or '0')
+    # Topic videos downloaded and transcribed concurrently
+    VIDEO_MAX_WORKERS: int = int(os.getenv('VIDEO_MAX_WORKERS', '4'))
     
     # Data Source Configuration
     NEWS_SOURCE_URL: str = os.getenv('NEWS_SOURCE_URL', 'https://today_arweave.ar.io/')
     GITHUB_FALLBACK_URL: str = os.getenv('GITHUB_FALLBACK_URL', 
                                          'https://raw.githubusercontent.com/ArweaveTeam/arweave-today/main/data/today.json')
     
+    # Skip the news source for a while after repeated fetch failures
+    NEWS_SOURCE_FAILURE_THRESHOLD: int = int(os.getenv('NEWS_SOURCE_FAILURE_THRESHOLD', '3'))
+    NEWS_SOURCE_RETRY_AFTER: int = int(os.getenv('NEWS_SOURCE_RETRY_AFTER', '300'))
+    # Attempts when the news source returns an invalid or empty payload, with exponential
+    # backoff (network errors are retried by the HTTP session instead)
+    NEWS_FETCH_ATTEMPTS: int = int(os.getenv('NEWS_FETCH_ATTEMPTS', '3'))
+    NEWS_FETCH_RETRY_DELAY: float = float(os.getenv('NEWS_FETCH_RETRY_DELAY', '0.5'))
+    NEWS_FETCH_MAX_DELAY: float = float(os.getenv('NEWS_FETCH_MAX_DELAY', '8'))
+    # Online/auto modes reuse news data fetched less than this many seconds ago (0 disables)
+    NEWS_CACHE_TTL: int = int(os.getenv('NEWS_CACHE_TTL', '14400'))
+    
     # Gemini AI Configuration
     GEMINI_API_KEY: str = os.getenv('GEMINI_API_KEY', '')
     ENABLE_GEMINI_SCRIPT_GENERATION: bool = os.getenv('ENABLE_GEMINI_SCRIPT_GENERATION', 'True').lower() == 'true'
+    # Seconds a generated script is reused for an identical prompt (0 disables)
+    GEMINI_CACHE_TTL: int = int(os.getenv('GEMINI_CACHE_TTL', '86400'))
+    # Seconds a successful Gemini connectivity check is reused for
+    INTEGRATION_CHECK_TTL: int = int(os.getenv('INTEGRATION_CHECK_TTL', '3600'))
+    
+    # Text-to-speech Configuration
+    ENABLE_PARALLEL_TTS: bool = os.getenv('ENABLE_PARALLEL_TTS', 'False').lower() == 'true'
+    TTS_MAX_WORKERS: int = int(os.getenv('TTS_MAX_WORKERS', '4'))
+    TTS_SENTENCES_PER_SHARD: int = int(os.getenv('TTS_SENTENCES_PER_SHARD', '15'))
+    
+    # Web interface: podcast jobs generated concurrently
+    PODCAST_WORKERS: int = int(os.getenv('PODCAST_WORKERS', '4'))
     
     @classmethod
     def is_gemini_configured(cls) -> bool:
@@ -50,6 +95,11 @@ class Config:
         """Get the output directory path for a given date."""
         return os.path.join(base_dir, 'output', date_folder)
     
+    @classmethod
+    def get_transcript_cache_dir(cls, base_dir: str) -> str:
+        """Get the video transcript cache directory shared by all dates."""
+        return os.path.join(base_dir, 'output', '.transcript_cache')
+    
     @classmethod
     def get_data_dir(cls, base_dir: str, date_folder: str) -> str:
         """Get the data directory path for a given date."""
@@ -5,9 +5,28 @@ This module contains functions for file operations, directory management, and da
 """
 
 import os
+import calendar
+import hashlib
 import json
+import logging
+import mmap
+import stat
+import tempfile
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import BinaryIO, Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    # orjson is an optional speedup; fall back to the standard library
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Process umask, read once at import since os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
 
 def ensure_directory_exists(directory_path: str) -> None:
@@ -20,6 +39,132 @@ def ensure_directory_exists(directory_path: str) -> None:
     os.makedirs(directory_path, exist_ok=True)
 
 
+def json_loads(data: bytes) -> Any:
+    """
+    Parse JSON from UTF-8 encoded bytes.
+    
+    Args:
+        data: Raw JSON document
+        
+    Returns:
+        Parsed JSON value
+        
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serialize a value to UTF-8 encoded JSON.
+    
+    Args:
+        data: Value to serialize
+        indent: Pretty-print with two-space indentation
+        sort_keys: Emit object keys in sorted order
+        
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False,
+                      sort_keys=sort_keys).encode('utf-8')
+
+
+def compute_content_hash(data: Any) -> str:
+    """
+    Compute a stable hash of JSON-serializable content.
+    
+    Args:
+        data: Value to hash
+        
+    Returns:
+        Hex digest that only changes when the content changes
+    """
+    return hashlib.blake2b(json_dumps(data, sort_keys=True), digest_size=16).hexdigest()
+
+
+def _new_file_mode(file_path: str) -> int:
+    """
+    Get the permission bits a rewritten file should have.
+    
+    Args:
+        file_path: Destination path
+        
+    Returns:
+        The existing file's mode, or the default 0o666 masked by the umask for a new file
+    """
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _atomic_write_bytes(file_path: str, data: bytes) -> None:
+    """
+    Write bytes to a file atomically via a temporary file and os.replace.
+    
+    Readers never observe a partially written file, and the data is flushed to
+    disk before the rename so a crash cannot leave an empty file in its place.
+    The file keeps its existing permissions, or gets the umask default if new.
+    
+    Args:
+        file_path: Destination path
+        data: Bytes to write
+    """
+    # Hidden temporary name next to the target, e.g. .today-abc123.json
+    stem, extension = os.path.splitext(os.path.basename(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or '.',
+                                    prefix=f".{stem}-", suffix=extension)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+        os.close(fd)
+        fd = -1
+        # mkstemp creates the file as 0o600; give it the mode open() would have
+        os.chmod(tmp_path, _new_file_mode(file_path))
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if fd != -1:
+            os.close(fd)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _file_has_content(file_path: str, data: bytes) -> bool:
+    """
+    Check whether a file already holds exactly the given bytes.
+    
+    Args:
+        file_path: File to compare
+        data: Expected content
+        
+    Returns:
+        True if the file exists with identical content, False otherwise
+    """
+    try:
+        # Cheap size check first; only read the file when the sizes match
+        if os.stat(file_path).st_size != len(data):
+            return False
+        with open(file_path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
 def save_json_file(data: Dict[str, Any], file_path: str) -> bool:
     """
     Save dictionary data to a JSON file.
@@ -33,14 +178,43 @@ def save_json_file(data: Dict[str, Any], file_path: str) -> bool:
     """
     try:
         ensure_directory_exists(os.path.dirname(file_path))
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        content = json_dumps(data, indent=True)
+        if _file_has_content(file_path, content):
+            # Skip the rewrite, but keep the mtime as the time of the last save
+            os.utime(file_path)
+        else:
+            _atomic_write_bytes(file_path, content)
         return True
     except Exception as e:
-        print(f"⚠️ Error saving JSON file {file_path}: {e}")
+        logger.warning(f"⚠️ Error saving JSON file {file_path}: {e}")
         return False
 
 
+def _load_json_mapped(f: BinaryIO) -> Any:
+    """
+    Parse an open JSON file through a read-only memory map.
+    
+    orjson parses the mapped pages directly, so no intermediate copy of the file
+    is read into memory.
+    
+    Args:
+        f: File object opened in binary mode
+        
+    Returns:
+        Parsed JSON value
+    """
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Empty files and some filesystems cannot be mapped
+        return json_loads(f.read())
+    with mapped:
+        if orjson is not None:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+        return json.loads(mapped[:])
+
+
 def load_json_file(file_path: str) -> Optional[Dict[str, Any]]:
     """
     Load data from a JSON file.
@@ -52,16 +226,16 @@ def load_json_file(file_path: str) -> Optional[Dict[str, Any]]:
         Dictionary data or None if failed
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return _load_json_mapped(f)
     except FileNotFoundError:
-        print(f"⚠️ JSON file not found: {file_path}")
+        logger.warning(f"⚠️ JSON file not found: {file_path}")
         return None
     except json.JSONDecodeError as e:
-        print(f"⚠️ Error parsing JSON file {file_path}: {e}")
+        logger.warning(f"⚠️ Error parsing JSON file {file_path}: {e}")
         return None
     except Exception as e:
-        print(f"⚠️ Error loading JSON file {file_path}: {e}")
+        logger.warning(f"⚠️ Error loading JSON file {file_path}: {e}")
         return None
 
 
@@ -78,12 +252,18 @@ def save_text_file(content: str, file_path: str) -> bool:
     """
     try:
         ensure_directory_exists(os.path.dirname(file_path))
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"💾 Text file saved: {os.path.basename(file_path)}")
+        # Encode once and hand the bytes over in a single write
+        data = content.encode('utf-8')
+        if _file_has_content(file_path, data):
+            os.utime(file_path)
+            logger.debug(f"💾 Text file unchanged: {os.path.basename(file_path)}")
+            return True
+        # Written atomically so a crash never leaves a truncated script behind
+        _atomic_write_bytes(file_path, data)
+        logger.info(f"💾 Text file saved: {os.path.basename(file_path)}")
         return True
     except Exception as e:
-        print(f"⚠️ Error saving text file {file_path}: {e}")
+        logger.warning(f"⚠️ Error saving text file {file_path}: {e}")
         return False
 
 
@@ -101,10 +281,10 @@ def load_text_file(file_path: str) -> Optional[str]:
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
     except FileNotFoundError:
-        print(f"⚠️ Text file not found: {file_path}")
+        logger.warning(f"⚠️ Text file not found: {file_path}")
         return None
     except Exception as e:
-        print(f"⚠️ Error loading text file {file_path}: {e}")
+        logger.warning(f"⚠️ Error loading text file {file_path}: {e}")
         return None
 
 
@@ -150,6 +330,50 @@ def get_datestamp_from_timestamp(timestamp_ms: int) -> str:
     return pub_date.strftime('%Y-%m-%d')
 
 
+@lru_cache(maxsize=32)
+def get_dates_from_timestamp(timestamp_ms: int) -> Tuple[str, str, str]:
+    """
+    Get all date strings used for a publication from a single timestamp conversion.
+    
+    Results are cached, so saving the news data and generating the podcast for
+    the same timestamp convert it only once.
+    
+    Args:
+        timestamp_ms: Timestamp in milliseconds
+        
+    Returns:
+        Tuple of (date folder DD-MM-YYYY, formatted date, datestamp YYYY-MM-DD)
+    """
+    pub_date = datetime.fromtimestamp(timestamp_ms / 1000)
+    return (pub_date.strftime('%d-%m-%Y'), pub_date.strftime('%B %d, %Y'),
+            pub_date.strftime('%Y-%m-%d'))
+
+
+def _parse_date_folder(name: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse a DD-MM-YYYY folder name without going through strptime.
+    
+    Args:
+        name: Directory name
+        
+    Returns:
+        (year, month, day) tuple, or None if the name is not a date folder
+    """
+    if len(name) != 10 or name[2] != '-' or name[5] != '-':
+        return None
+    day, month, year = name[0:2], name[3:5], name[6:10]
+    # isdigit() alone also accepts non-ASCII digits (e.g. superscripts) that int() rejects
+    digits = day + month + year
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    date_key = (int(year), int(month), int(day))
+    # Same dates strptime accepts: no year 0, and no day past the end of its month
+    if not (date_key[0] >= 1 and 1 <= date_key[1] <= 12
+            and 1 <= date_key[2] <= calendar.monthrange(date_key[0], date_key[1])[1]):
+        return None
+    return date_key
+
+
 def find_most_recent_date_directory(base_data_dir: str) -> Optional[str]:
     """
     Find the most recent date directory in the data folder.
@@ -161,37 +385,57 @@ def find_most_recent_date_directory(base_data_dir: str) -> Optional[str]:
         Path to the most recent today.json file, or None if not found
     """
     try:
-        if not os.path.exists(base_data_dir):
+        if not os.path.isdir(base_data_dir):
             return None
-            
-        # Get all directories that match the date format
-        date_dirs = []
-        for item in os.listdir(base_data_dir):
-            item_path = os.path.join(base_data_dir, item)
-            if os.path.isdir(item_path):
-                # Check if it matches DD-MM-YYYY format
-                try:
-                    datetime.strptime(item, '%d-%m-%Y')
-                    today_json_path = os.path.join(item_path, 'today.json')
-                    if os.path.exists(today_json_path):
-                        date_dirs.append((item, today_json_path))
-                except ValueError:
-                    continue
-        
-        if not date_dirs:
+        
+        # Scanned on every call: today.json can appear or disappear inside an
+        # existing date folder without the data folder's mtime changing
+        result = _scan_date_directories(base_data_dir)
+        if result is None:
             return None
-            
-        # Sort by date (newest first)
-        date_dirs.sort(key=lambda x: datetime.strptime(x[0], '%d-%m-%Y'), reverse=True)
-        most_recent = date_dirs[0][1]
-        print(f"📅 Found most recent data: {date_dirs[0][0]}/today.json")
+        
+        folder_name, most_recent = result
+        logger.info(f"📅 Found most recent data: {folder_name}/today.json")
         return most_recent
         
     except Exception as e:
-        print(f"⚠️ Error finding recent date directory: {e}")
+        logger.warning(f"⚠️ Error finding recent date directory: {e}")
         return None
 
 
+def _scan_date_directories(base_data_dir: str) -> Optional[Tuple[str, str]]:
+    """
+    Scan the data folder for the newest date directory containing today.json.
+    
+    Args:
+        base_data_dir: Base data directory path
+        
+    Returns:
+        Tuple of (folder name, today.json path), or None if not found
+    """
+    # Get all directories that match the date format; scandir reports the
+    # entry type from the directory listing, so no stat per entry is needed
+    date_dirs = []
+    with os.scandir(base_data_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            # Check if it matches DD-MM-YYYY format
+            date_key = _parse_date_folder(entry.name)
+            if date_key is None:
+                continue
+            today_json_path = os.path.join(entry.path, 'today.json')
+            if os.path.exists(today_json_path):
+                date_dirs.append((date_key, entry.name, today_json_path))
+    
+    if not date_dirs:
+        return None
+    
+    # Newest date wins; (year, month, day) tuples compare chronologically
+    _, folder_name, most_recent = max(date_dirs)
+    return folder_name, most_recent
+
+
 def create_output_filename(base_name: str, datestamp: str, extension: str) -> str:
     """
     Create standardized output filename.
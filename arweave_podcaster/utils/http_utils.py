@@ -0,0 +1,59 @@
+"""
+HTTP utilities for Arweave Podcaster.
+
+This module provides the shared HTTP session used for all outgoing requests.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+_SESSION: Optional["requests.Session"] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_http_session() -> "requests.Session":
+    """
+    Get the process-wide HTTP session, creating it on first use.
+    
+    requests and urllib3 are imported here so that runs which never touch the
+    network (e.g. local data only) don't pay for importing them.
+    
+    Returns:
+        Session whose pooled keep-alive connections are shared by all callers
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            import urllib3
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            # Suppress SSL warnings when verification is disabled
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            
+            # Retry transient failures with exponential backoff, honouring Retry-After
+            retry_options = dict(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['GET']),
+                respect_retry_after_header=True,
+            )
+            try:
+                retry = Retry(backoff_jitter=0.3, **retry_options)
+            except TypeError:
+                # backoff_jitter needs urllib3 2.x
+                retry = Retry(**retry_options)
+            
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4,
+                                                  max_retries=retry))
+            # Only advertise encodings urllib3 can decode (br requires brotli)
+            session.headers.update(urllib3.util.make_headers(accept_encoding=True,
+                                                             keep_alive=True))
+            _SESSION = session
+    return _SESSION
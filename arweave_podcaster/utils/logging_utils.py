@@ -0,0 +1,64 @@
+"""
+Logging utilities for Arweave Podcaster.
+
+This module configures logging so that records from worker threads are handed
+to a single background thread that writes them to stdout.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .config import config
+
+# Level used when LOG_LEVEL is not a valid level name
+DEFAULT_LOG_LEVEL = 'INFO'
+
+_log_queue: Optional[queue.Queue] = None
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Route all log records through a queue drained by one listener thread.
+    
+    The level applies to this package's loggers only; other libraries (httpx,
+    faster_whisper, ...) stay at WARNING. Calling this more than once has no effect.
+    
+    Args:
+        level: Log level name (defaults to config.LOG_LEVEL, or DEFAULT_LOG_LEVEL
+            if that is not a valid level name)
+    """
+    global _log_queue, _listener
+    if _listener is not None:
+        return
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    _log_queue = queue.Queue()
+    _listener = QueueListener(_log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+    
+    root = logging.getLogger()
+    root.setLevel(logging.WARNING)
+    root.addHandler(QueueHandler(_log_queue))
+    
+    level_name = str(level or config.LOG_LEVEL).upper()
+    numeric_level = logging.getLevelName(level_name)
+    package_logger = logging.getLogger('arweave_podcaster')
+    if isinstance(numeric_level, int):
+        package_logger.setLevel(numeric_level)
+    else:
+        package_logger.setLevel(DEFAULT_LOG_LEVEL)
+        package_logger.warning(f"⚠️ Invalid LOG_LEVEL '{level_name}', using {DEFAULT_LOG_LEVEL}")
+
+
+def flush_logging() -> None:
+    """Wait until every queued log record has been written (e.g. before prompting)."""
+    if _log_queue is not None:
+        _log_queue.join()
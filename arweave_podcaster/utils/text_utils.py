@@ -7,6 +7,22 @@ This module contains functions for cleaning and processing text content for audi
 import re
 from typing import List, Dict, Any
 
+# Section templates used by format_news_topics: (nature, body)
+_FIRST_TOPIC_TEMPLATE = "First up, in {} news: {}"
+_MIDDLE_TOPIC_TEMPLATE = "Moving to {} news: {}"
+_LAST_TOPIC_TEMPLATE = "And finally, in {} news: {}"
+
+# Patterns used by clean_script_for_audio, applied in this order
+_EMPHASIS_RE = re.compile(r'\*\*.*?\*\*')
+_SEPARATOR_RE = re.compile(r'^(?:-{3,}|={3,}).*$', re.MULTILINE)
+# One pass per keyword: a fused alternation would match a different span when
+# several directions share a line, e.g. "(transition) ... (music)"
+_STAGE_DIRECTION_RES = tuple(
+    re.compile(rf'\(.*?{keyword}.*?\)', re.IGNORECASE)
+    for keyword in ('sound effect', 'transition', 'music',
+                    'fades? in', 'fades? out', 'fades? up', 'plays to end'))
+_HOST_LABEL_RE = re.compile(r'^Host:\s*', re.MULTILINE)
+
 
 def clean_script_for_audio(script_text: str) -> str:
     """
@@ -19,37 +35,46 @@ def clean_script_for_audio(script_text: str) -> str:
     Returns:
         Cleaned text suitable for text-to-speech conversion
     """
-    # Remove lines with stage directions in double asterisks
-    script_text = re.sub(r'\*\*.*?\*\*', '', script_text)
-    
-    # Remove separator lines with dashes
-    script_text = re.sub(r'^-{3,}.*$', '', script_text, flags=re.MULTILINE)
-    script_text = re.sub(r'^={3,}.*$', '', script_text, flags=re.MULTILINE)
-    
-    # Remove transition sound effect markers
-    script_text = re.sub(r'\(.*?sound effect.*?\)', '', script_text, flags=re.IGNORECASE)
-    script_text = re.sub(r'\(.*?transition.*?\)', '', script_text, flags=re.IGNORECASE)
-    script_text = re.sub(r'\(.*?music.*?\)', '', script_text, flags=re.IGNORECASE)
+    # Remove text in double asterisks (stage directions, **Host:** labels)
+    script_text = _EMPHASIS_RE.sub('', script_text)
     
-    # Remove other parenthetical stage directions
-    script_text = re.sub(r'\(.*?fades? in.*?\)', '', script_text, flags=re.IGNORECASE)
-    script_text = re.sub(r'\(.*?fades? out.*?\)', '', script_text, flags=re.IGNORECASE)
-    script_text = re.sub(r'\(.*?fades? up.*?\)', '', script_text, flags=re.IGNORECASE)
-    script_text = re.sub(r'\(.*?plays to end.*?\)', '', script_text, flags=re.IGNORECASE)
+    # Remove separator lines of dashes or equals signs
+    script_text = _SEPARATOR_RE.sub('', script_text)
     
-    # Remove host labels and formatting
-    script_text = re.sub(r'^\*\*Host:\*\*\s*', '', script_text, flags=re.MULTILINE)
-    script_text = re.sub(r'^Host:\s*', '', script_text, flags=re.MULTILINE)
+    # Remove parenthetical stage directions (sound effects, transitions, music, fades)
+    for stage_direction_re in _STAGE_DIRECTION_RES:
+        script_text = stage_direction_re.sub('', script_text)
     
-    # Clean up multiple newlines and whitespace
-    script_text = re.sub(r'\n\s*\n\s*\n+', '\n\n', script_text)
-    script_text = re.sub(r'^\s+', '', script_text, flags=re.MULTILINE)
-    script_text = re.sub(r'\s+$', '', script_text, flags=re.MULTILINE)
+    # Remove host labels
+    script_text = _HOST_LABEL_RE.sub('', script_text)
     
-    # Remove empty lines at start and end
-    script_text = script_text.strip()
-    
-    return script_text
+    # Trim every line and drop blank ones in a single pass
+    stripped_lines = (line.strip() for line in script_text.split('\n'))
+    return '\n'.join(line for line in stripped_lines if line)
+
+
+def split_text_into_shards(text: str, sentences_per_shard: int = 15) -> List[str]:
+    """
+    Split text on sentence boundaries into groups suitable for separate TTS requests.
+
+    Args:
+        text: Text to split
+        sentences_per_shard: Maximum number of sentences in each shard
+
+    Returns:
+        List of text shards in their original order
+    """
+    text = text.strip()
+    if not text:
+        return []
+
+    step = max(1, sentences_per_shard)
+    boundaries = [m.start() for m in re.finditer(r'(?<=[.!?])\s+', text)]
+
+    # Cut after every `step` sentences, keeping the original whitespace inside shards
+    cuts = [0] + boundaries[step - 1::step] + [len(text)]
+    shards = [text[start:end].strip() for start, end in zip(cuts, cuts[1:])]
+    return [shard for shard in shards if shard]
 
 
 def format_news_topics(topics: List[Dict[str, Any]]) -> str:
@@ -63,21 +88,22 @@ def format_news_topics(topics: List[Dict[str, Any]]) -> str:
         Formatted text string
     """
     formatted_sections = []
+    append = formatted_sections.append
+    last = len(topics)
     
     for i, topic in enumerate(topics, 1):
-        nature = topic.get('nature', 'news').title()
-        headline = topic.get('headline', 'No headline')
+        nature = topic.get('nature', 'news').lower()
         body = topic.get('body', 'No content available')
         
         # Create section header
         if i == 1:
-            section_text = f"First up, in {nature.lower()} news: {body}"
-        elif i == len(topics):
-            section_text = f"And finally, in {nature.lower()} news: {body}"
+            template = _FIRST_TOPIC_TEMPLATE
+        elif i == last:
+            template = _LAST_TOPIC_TEMPLATE
         else:
-            section_text = f"Moving to {nature.lower()} news: {body}"
+            template = _MIDDLE_TOPIC_TEMPLATE
         
-        formatted_sections.append(section_text)
+        append(template.format(nature, body))
     
     return "\n\n".join(formatted_sections)
 
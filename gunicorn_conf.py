@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for the Arweave Today AI Podcaster web interface.
+
+Usage:
+    gunicorn -c gunicorn_conf.py web_app:app
+
+Job status and the podcast worker pool live in the web process, so a single
+worker process is used and concurrency comes from its threads: status polls and
+uploads are served in parallel while podcasts generate in the background.
+"""
+
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+
+# One process keeps every job visible to /status and /download
+workers = 1
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', str(4 * (os.cpu_count() or 1))))
+
+# Keep polling clients' connections open between status requests
+keepalive = 30
+timeout = 120
+
+
+def post_worker_init(worker):
+    """Start the queued logging used by the podcast generator."""
+    from arweave_podcaster.utils.logging_utils import configure_logging
+    configure_logging()
@@ -25,6 +25,9 @@ Examples:
   python main.py                          # Interactive mode - choose data source
   python main.py -f data/today.json       # Generate from specific JSON file
   python main.py --file data/04-07-2025/today.json  # Generate from dated file
+  python main.py --no-cache               # Ignore recently fetched news and cached scripts
+  python main.py --source online          # Skip the data source menu
+  python main.py --non-interactive        # Never prompt (cron/CI), defaults to auto
         """
     )
     
@@ -34,6 +37,24 @@ Examples:
         help="Path to JSON file containing news data for podcast generation"
     )
     
+    parser.add_argument(
+        "--source",
+        choices=["online", "local", "auto"],
+        help="Data source to use without showing the selection menu"
+    )
+    
+    parser.add_argument(
+        "--non-interactive",
+        action="store_true",
+        help="Never prompt for input; uses --source or auto"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Fetch news online and regenerate the script and audio instead of reusing cached results"
+    )
+    
     parser.add_argument(
         "--version",
         action="version",
@@ -44,4 +65,5 @@ Examples:
 
 if __name__ == "__main__":
     args = parse_args()
-    main(json_file=args.file)
+    main(json_file=args.file, use_cache=not args.no_cache,
+         source=args.source, interactive=not args.non_interactive)
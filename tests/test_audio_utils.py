@@ -0,0 +1,60 @@
+"""
+Tests for audio utilities.
+"""
+
+import os
+import pytest
+from arweave_podcaster.utils.audio_utils import WAV_HEADER_SIZE, write_wav_stream
+
+
+def _failing_stream():
+    """Yield one chunk, then fail like a TTS quota error."""
+    yield b"\x01\x02", "audio/L16;rate=24000"
+    raise RuntimeError("quota exceeded")
+
+
+class TestWriteWavStream:
+    """Test streaming audio chunks into a WAV file."""
+
+    def test_writes_header_and_data(self, tmp_path):
+        """Test that raw PCM gets a WAV header sized to the streamed data."""
+        path = tmp_path / "podcast.wav"
+        chunks = [(b"\x01\x02", "audio/L16;rate=24000"), (b"\x03\x04", "audio/L16;rate=24000")]
+
+        assert write_wav_stream(str(path), chunks) == 4
+
+        data = path.read_bytes()
+        assert data[:4] == b"RIFF"
+        assert data[WAV_HEADER_SIZE:] == b"\x01\x02\x03\x04"
+        assert os.listdir(tmp_path) == ["podcast.wav"]
+
+    def test_failed_stream_keeps_existing_file(self, tmp_path):
+        """Test that an error mid-stream leaves the previous podcast untouched."""
+        path = tmp_path / "podcast.wav"
+        path.write_bytes(b"previous podcast")
+
+        with pytest.raises(RuntimeError):
+            write_wav_stream(str(path), _failing_stream())
+
+        assert path.read_bytes() == b"previous podcast"
+        assert os.listdir(tmp_path) == ["podcast.wav"]
+
+    def test_empty_stream_keeps_existing_file(self, tmp_path):
+        """Test that a stream without audio does not replace the previous podcast."""
+        path = tmp_path / "podcast.wav"
+        path.write_bytes(b"previous podcast")
+
+        assert write_wav_stream(str(path), [(b"", None)]) == 0
+
+        assert path.read_bytes() == b"previous podcast"
+        assert os.listdir(tmp_path) == ["podcast.wav"]
+
+    def test_empty_stream_creates_no_file(self, tmp_path):
+        """Test that a stream without audio leaves no file behind."""
+        assert write_wav_stream(str(tmp_path / "podcast.wav"), []) == 0
+
+        assert os.listdir(tmp_path) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
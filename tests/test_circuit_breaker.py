@@ -0,0 +1,50 @@
+"""
+Tests for the circuit breaker.
+"""
+
+import pytest
+from unittest.mock import patch
+from arweave_podcaster.utils.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def test_opens_after_threshold(self, tmp_path):
+        """Test that the circuit opens after consecutive failures."""
+        breaker = CircuitBreaker(str(tmp_path / "cb.json"), failure_threshold=3)
+
+        for _ in range(2):
+            breaker.record_failure()
+            assert breaker.allow_request() is True
+
+        breaker.record_failure()
+
+        assert breaker.allow_request() is False
+
+    def test_state_is_persisted(self, tmp_path):
+        """Test that a new instance sees the open circuit."""
+        state_path = str(tmp_path / "cb.json")
+        CircuitBreaker(state_path, failure_threshold=1).record_failure()
+
+        assert CircuitBreaker(state_path).allow_request() is False
+
+    def test_half_open_probe(self, tmp_path):
+        """Test the probe after the reset timeout closes or re-opens the circuit."""
+        breaker = CircuitBreaker(str(tmp_path / "cb.json"), failure_threshold=1,
+                                 reset_timeout=300)
+        breaker.record_failure()
+
+        with patch("arweave_podcaster.utils.circuit_breaker.time.time",
+                   return_value=10**10):
+            assert breaker.allow_request() is True
+            breaker.record_failure()
+            assert breaker.allow_request() is False
+
+        breaker.record_success()
+
+        assert breaker.allow_request() is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,52 @@
+"""
+Tests for the data service.
+"""
+
+import pytest
+from unittest.mock import patch
+from arweave_podcaster.services.data_service import DataService
+from arweave_podcaster.utils.config import config
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Data service with its data and breaker state under a temporary directory."""
+    with patch.object(config, 'CACHE_DIR', str(tmp_path / "cache")):
+        yield DataService(str(tmp_path))
+
+
+class TestFetchRetries:
+    """Test retrying of the online news fetch."""
+
+    def test_network_error_is_not_retried(self, service):
+        """Test that failures already retried by the session are tried once."""
+        with patch.object(service, '_fetch_from_source',
+                          return_value=(None, False)) as fetch, \
+                patch("arweave_podcaster.services.data_service.time.sleep") as sleep:
+            assert service.fetch_online_news_data("https://example.com/") is None
+
+        assert fetch.call_count == 1
+        sleep.assert_not_called()
+
+    def test_bad_payload_is_retried(self, service):
+        """Test that an invalid payload is retried until a valid one arrives."""
+        results = [(None, True), (None, True), ({'ts': 1}, False)]
+        with patch.object(config, 'NEWS_FETCH_ATTEMPTS', 3), \
+                patch.object(service, '_fetch_from_source', side_effect=results), \
+                patch("arweave_podcaster.services.data_service.time.sleep") as sleep:
+            assert service.fetch_online_news_data("https://example.com/") == {'ts': 1}
+
+        assert sleep.call_count == 2
+
+    def test_failed_run_counts_one_breaker_failure(self, service):
+        """Test that exhausting every attempt records a single breaker failure."""
+        with patch.object(config, 'NEWS_FETCH_ATTEMPTS', 3), \
+                patch.object(service, '_fetch_from_source', return_value=(None, True)), \
+                patch("arweave_podcaster.services.data_service.time.sleep"):
+            service.fetch_online_news_data("https://example.com/")
+
+        assert service.circuit_breaker._load_state()['failures'] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
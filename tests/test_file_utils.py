@@ -0,0 +1,173 @@
+"""
+Tests for file utilities.
+"""
+
+import os
+import stat
+import pytest
+from unittest.mock import patch
+from arweave_podcaster.utils import file_utils
+from arweave_podcaster.utils.file_utils import (
+    _parse_date_folder, find_most_recent_date_directory,
+    load_json_file, save_json_file, save_text_file
+)
+
+
+def _write_today_json(data_dir, folder):
+    """Create data_dir/folder/today.json and return its path."""
+    path = data_dir / folder / "today.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('{"ts": 0}')
+    return path
+
+
+class TestParseDateFolder:
+    """Test parsing of DD-MM-YYYY folder names."""
+
+    def test_valid_name(self):
+        """Test that a date folder parses to (year, month, day)."""
+        assert _parse_date_folder("04-07-2025") == (2025, 7, 4)
+
+    @pytest.mark.parametrize("name", [
+        "2025-07-04", "4-7-2025", "04_07_2025", "ab-cd-efgh", "04-07-2025x", "",
+        "0\u00b2-10-2026", "04-\u0661\u0660-2026",
+    ])
+    def test_invalid_names(self, name):
+        """Test that other names, including non-ASCII digits, are rejected."""
+        assert _parse_date_folder(name) is None
+
+    @pytest.mark.parametrize("name", [
+        "04-13-2025", "04-00-2025", "00-07-2025", "32-07-2025",
+        "31-02-2025", "29-02-2025", "31-04-2026", "01-01-0000",
+    ])
+    def test_out_of_range(self, name):
+        """Test that impossible dates, including days past the end of the month, are rejected."""
+        assert _parse_date_folder(name) is None
+
+    def test_leap_day(self):
+        """Test that 29 February is accepted in a leap year."""
+        assert _parse_date_folder("29-02-2024") == (2024, 2, 29)
+
+    def test_stray_folder_does_not_hide_data(self, tmp_path):
+        """Test that a folder with non-ASCII digits is skipped by the scan."""
+        (tmp_path / "0\u00b2-10-2026").mkdir()
+        expected = _write_today_json(tmp_path, "15-10-2026")
+
+        assert find_most_recent_date_directory(str(tmp_path)) == str(expected)
+
+
+class TestFindMostRecentDateDirectory:
+    """Test locating the newest dated today.json."""
+
+    def test_picks_newest_date(self, tmp_path):
+        """Test that dates compare chronologically, not by folder name."""
+        _write_today_json(tmp_path, "31-12-2025")
+        newest = _write_today_json(tmp_path, "01-01-2026")
+
+        assert find_most_recent_date_directory(str(tmp_path)) == str(newest)
+
+    def test_sees_today_json_changes_in_existing_folders(self, tmp_path):
+        """Test that adding or removing today.json in an existing folder is noticed."""
+        older = _write_today_json(tmp_path, "15-10-2026")
+        (tmp_path / "16-10-2026").mkdir()
+        assert find_most_recent_date_directory(str(tmp_path)) == str(older)
+
+        newer = _write_today_json(tmp_path, "16-10-2026")
+        assert find_most_recent_date_directory(str(tmp_path)) == str(newer)
+
+        newer.unlink()
+        assert find_most_recent_date_directory(str(tmp_path)) == str(older)
+
+    def test_missing_data_dir(self, tmp_path):
+        """Test that a missing data folder yields None."""
+        assert find_most_recent_date_directory(str(tmp_path / "missing")) is None
+
+
+
+class TestSaveFiles:
+    """Test atomic and skip-if-unchanged file saves."""
+
+    @pytest.mark.parametrize("save, content", [
+        (save_json_file, {"ts": 1, "topics": ["a"]}),
+        (save_text_file, "Script text"),
+    ])
+    def test_unchanged_write_is_skipped(self, tmp_path, save, content):
+        """Test that saving identical content keeps the file but bumps its mtime."""
+        path = tmp_path / "out" / "file.txt"
+        assert save(content, str(path))
+        inode = path.stat().st_ino
+        os.utime(path, (0, 0))
+
+        with patch.object(file_utils, '_atomic_write_bytes') as atomic_write:
+            assert save(content, str(path))
+
+        atomic_write.assert_not_called()
+        assert path.stat().st_ino == inode
+        assert path.stat().st_mtime > 0
+
+    def test_changed_content_is_rewritten(self, tmp_path):
+        """Test that different content replaces the file."""
+        path = tmp_path / "script.txt"
+        save_text_file("old", str(path))
+        save_text_file("new", str(path))
+
+        assert path.read_text() == "new"
+
+    def test_no_temp_files_left_behind(self, tmp_path):
+        """Test that atomic writes leave only the target file."""
+        save_json_file({"ts": 1}, str(tmp_path / "today.json"))
+        save_json_file({"ts": 2}, str(tmp_path / "today.json"))
+        save_text_file("Script", str(tmp_path / "script.txt"))
+
+        assert sorted(os.listdir(tmp_path)) == ["script.txt", "today.json"]
+
+    def test_failed_write_removes_temp_file(self, tmp_path):
+        """Test that a failed rename cleans up its temporary file."""
+        with patch("arweave_podcaster.utils.file_utils.os.replace", side_effect=OSError("boom")):
+            assert not save_text_file("Script", str(tmp_path / "script.txt"))
+
+        assert os.listdir(tmp_path) == []
+
+    def test_new_file_mode_follows_umask(self, tmp_path):
+        """Test that a new file gets the default mode masked by the umask."""
+        path = tmp_path / "script.txt"
+        with patch.object(file_utils, '_UMASK', 0o077):
+            save_text_file("Script", str(path))
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    def test_rewrite_keeps_existing_mode(self, tmp_path):
+        """Test that replacing a file keeps its permissions."""
+        path = tmp_path / "script.txt"
+        save_text_file("old", str(path))
+        os.chmod(path, 0o640)
+
+        save_text_file("new", str(path))
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+class TestLoadJsonFile:
+    """Test loading JSON files."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that saved data loads back unchanged."""
+        path = str(tmp_path / "today.json")
+        save_json_file({"ts": 1, "name": "caf\u00e9"}, path)
+
+        assert load_json_file(path) == {"ts": 1, "name": "caf\u00e9"}
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file yields None."""
+        path = tmp_path / "today.json"
+        path.write_bytes(b"")
+
+        assert load_json_file(str(path)) is None
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing file yields None."""
+        assert load_json_file(str(tmp_path / "missing.json")) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
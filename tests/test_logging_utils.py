@@ -0,0 +1,48 @@
+"""
+Tests for logging utilities.
+"""
+
+import atexit
+import logging
+import pytest
+from arweave_podcaster.utils import logging_utils
+
+
+@pytest.fixture
+def fresh_logging():
+    """Run configure_logging from scratch and undo its changes afterwards."""
+    root = logging.getLogger()
+    package_logger = logging.getLogger('arweave_podcaster')
+    saved = (root.level, list(root.handlers), package_logger.level)
+    logging_utils._listener = None
+    yield
+    if logging_utils._listener is not None:
+        atexit.unregister(logging_utils._listener.stop)
+        logging_utils._listener.stop()
+    logging_utils._listener = None
+    logging_utils._log_queue = None
+    root.setLevel(saved[0])
+    root.handlers[:] = saved[1]
+    package_logger.setLevel(saved[2])
+
+
+class TestConfigureLogging:
+    """Test log level configuration."""
+
+    def test_level_applies_to_package_only(self, fresh_logging):
+        """Test that LOG_LEVEL does not enable INFO output from other libraries."""
+        logging_utils.configure_logging("DEBUG")
+
+        assert logging.getLogger('arweave_podcaster.services').isEnabledFor(logging.DEBUG)
+        assert not logging.getLogger('httpx').isEnabledFor(logging.INFO)
+        assert logging.getLogger('httpx').isEnabledFor(logging.WARNING)
+
+    def test_invalid_level_falls_back_to_default(self, fresh_logging):
+        """Test that an unknown level name does not raise."""
+        logging_utils.configure_logging("LOUD")
+
+        assert logging.getLogger('arweave_podcaster').level == logging.INFO
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
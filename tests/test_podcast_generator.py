@@ -0,0 +1,42 @@
+"""
+Tests for the podcast generator.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from arweave_podcaster.core.podcast_generator import PodcastGenerator
+from arweave_podcaster.utils.config import config
+
+
+@pytest.fixture
+def generator(tmp_path):
+    """Generator with a mocked Gemini service and state under a temporary directory."""
+    with patch.object(config, 'CACHE_DIR', str(tmp_path / "cache")), \
+            patch.object(config, 'GEMINI_API_KEY', ''):
+        generator = PodcastGenerator(str(tmp_path))
+        generator.gemini_service = MagicMock()
+        generator.gemini_service.test_connection.return_value = True
+        yield generator
+
+
+class TestGeminiConnectionCheck:
+    """Test reuse of successful Gemini connection checks."""
+
+    def test_recent_check_is_reused(self, generator):
+        """Test that a successful check skips the next one."""
+        assert generator._check_gemini_connection()
+        assert generator._check_gemini_connection()
+
+        assert generator.gemini_service.test_connection.call_count == 1
+
+    def test_failed_request_forces_new_check(self, generator):
+        """Test that forgetting the check after a failure tests the connection again."""
+        assert generator._check_gemini_connection()
+        generator._forget_gemini_connection()
+        assert generator._check_gemini_connection()
+
+        assert generator.gemini_service.test_connection.call_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
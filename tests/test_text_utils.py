@@ -6,6 +6,7 @@ import pytest
 from arweave_podcaster.utils.text_utils import (
     clean_script_for_audio, 
     format_news_topics,
+    split_text_into_shards,
     create_podcast_opening,
     create_podcast_closing
 )
@@ -34,6 +35,46 @@ class TestTextUtils:
         assert "Welcome to the show!" in cleaned
         assert "This is the main content." in cleaned
     
+    def test_clean_script_strips_emphasis_and_separators(self):
+        """Test removal of double-asterisk text and separator lines in mixed input."""
+        raw_script = "Intro **(laughs)** here\n---- PART 1 ----\n=====\n**Host:** Body -- text"
+        
+        assert clean_script_for_audio(raw_script) == "Intro  here\nBody -- text"
+    
+    def test_clean_script_strips_stage_directions(self):
+        """Test removal of parenthetical stage directions in mixed input."""
+        raw_script = (
+            "(Music fades in)\n"
+            "News today (pause) continues.\n"
+            "(transition) Next story (FADES OUT)\n"
+            "Outro (theme plays to end)"
+        )
+        
+        assert clean_script_for_audio(raw_script) == (
+            "News today (pause) continues.\nNext story\nOutro"
+        )
+    
+    def test_clean_script_stage_directions_span_first_parenthesis(self):
+        """Test that each keyword pass removes from the first opening parenthesis on its line."""
+        raw_script = "(transition) Next story (sound effect: chime) ends"
+        
+        assert clean_script_for_audio(raw_script) == "ends"
+    
+    def test_clean_script_strips_host_labels_and_blank_lines(self):
+        """Test removal of line-leading host labels and collapsing of whitespace."""
+        raw_script = "Host: Hello\n\n\n\n  Host:  again  \nCo-Host: stays\n   \n"
+        
+        assert clean_script_for_audio(raw_script) == "Hello\nHost:  again\nCo-Host: stays"
+    
+    def test_split_text_into_shards(self):
+        """Test splitting text into sentence groups for TTS."""
+        text = "First sentence. Second one! Third?\n\nFourth. Fifth."
+        
+        shards = split_text_into_shards(text, sentences_per_shard=2)
+        
+        assert shards == ["First sentence. Second one!", "Third?\n\nFourth.", "Fifth."]
+        assert split_text_into_shards("", sentences_per_shard=2) == []
+    
     def test_create_podcast_opening(self):
         """Test podcast opening generation."""
         date_str = "July 04, 2025"
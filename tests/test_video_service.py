@@ -0,0 +1,45 @@
+"""
+Tests for the video service.
+"""
+
+import pytest
+from unittest.mock import patch
+from arweave_podcaster.services.video_service import VideoService
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Video service writing transcripts under a temporary directory."""
+    return VideoService(str(tmp_path / "output"), cache_dir=str(tmp_path / "cache"))
+
+
+class TestTranscriptCache:
+    """Test reuse of saved transcripts."""
+
+    def test_silent_video_is_not_reprocessed(self, service, tmp_path):
+        """Test that a video without speech is cached and not downloaded again."""
+        audio_path = tmp_path / "audio.mp3"
+        audio_path.write_bytes(b"")
+        with patch.object(service, '_download_audio', return_value=str(audio_path)) as download, \
+                patch.object(service, '_transcribe_audio', return_value=""):
+            assert service.transcribe_video("https://example.com/v.mp4", "topic_1") == ""
+            assert service.transcribe_video("https://example.com/v.mp4", "topic_1") == ""
+            assert service.transcribe_video("https://example.com/v.mp4", "topic_2") == ""
+
+        assert download.call_count == 1
+
+    def test_failed_transcription_is_retried(self, service, tmp_path):
+        """Test that a failed transcription is attempted again on the next run."""
+        audio_path = tmp_path / "audio.mp3"
+        with patch.object(service, '_download_audio', return_value=str(audio_path)) as download, \
+                patch.object(service, '_transcribe_audio', side_effect=[None, "Hello"]):
+            audio_path.write_bytes(b"")
+            assert service.transcribe_video("https://example.com/v.mp4", "topic_1") == ""
+            audio_path.write_bytes(b"")
+            assert service.transcribe_video("https://example.com/v.mp4", "topic_1") == "Hello"
+
+        assert download.call_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -5,19 +5,24 @@ A Flask web application for uploading or pasting JSON files to generate podcasts
 """
 
 import os
+import hashlib
 import json
+import mimetypes
+import secrets
 import tempfile
-import uuid
 from datetime import datetime
-from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, flash
-from werkzeug.utils import secure_filename
+from urllib.parse import quote
+from flask import Flask, render_template, request, send_file, redirect, url_for, flash, stream_with_context
+from werkzeug.exceptions import RequestEntityTooLarge
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import time
 
 # Import our podcast generator
 from arweave_podcaster.core.podcast_generator import PodcastGenerator
-from arweave_podcaster.utils.config import config
+from arweave_podcaster.utils.config import PROJECT_ROOT, config
+from arweave_podcaster.utils.file_utils import json_dumps, json_loads
+from arweave_podcaster.utils.logging_utils import configure_logging
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -25,18 +30,79 @@ app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key-change-in-pr
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 OUTPUT_FOLDER = 'output'
-ALLOWED_EXTENSIONS = {'json'}
+ALLOWED_EXTENSIONS = ('.json',)
+# Largest accepted request body; Werkzeug rejects bigger ones before reading them
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', 16 * 1024 * 1024))
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+
+# Let the front-end server send downloads itself instead of streaming them through Python:
+# USE_X_SENDFILE=true for Apache/lighttpd, X_ACCEL_REDIRECT_PREFIX=/protected/ for an nginx
+# internal location that aliases the output directory
+app.use_x_sendfile = os.environ.get('USE_X_SENDFILE', 'False').lower() == 'true'
+X_ACCEL_REDIRECT_PREFIX = os.environ.get('X_ACCEL_REDIRECT_PREFIX', '')
+GENERATED_OUTPUT_ROOT = os.path.join(PROJECT_ROOT, 'output')
 
 # Ensure directories exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
-# Global storage for job status
+# Global storage for job status, shared between request handlers and job threads
 job_status = {}
+_status_lock = threading.Lock()
+# Notified whenever a job's status changes, for the /events streams
+_status_changed = threading.Condition(_status_lock)
+# Seconds between keep-alive comments on an idle /events stream
+EVENTS_KEEPALIVE_SECONDS = 15
+
+# Bounded pool that runs podcast jobs; extra submissions wait in its queue
+_POOL = ThreadPoolExecutor(max_workers=max(1, config.PODCAST_WORKERS),
+                           thread_name_prefix='podcast')
+# Futures of submitted jobs, guarded by _status_lock
+_job_futures = {}
+
+# One PodcastGenerator per pool thread; an instance holds per-run state
+_thread_state = threading.local()
+
+# Example news data served by /example, serialized once at import time
+_EXAMPLE_NEWS_DATA = {
+    "topics": [
+        {
+            "headline": "Arweave Network Upgrade Announcement",
+            "body": "The Arweave team has announced a major network upgrade that will improve transaction throughput and reduce storage costs. This upgrade introduces new consensus mechanisms and optimizes data retrieval performance.",
+            "url": "https://example.com/arweave-upgrade",
+            "nature": "development",
+            "video": "https://youtube.com/watch?v=example1"
+        },
+        {
+            "headline": "New Permaweb Applications Launch", 
+            "body": "Several innovative applications have been launched on the Permaweb this week, including a decentralized social media platform and a permanent document storage service.",
+            "url": "https://example.com/permaweb-apps",
+            "nature": "community"
+        }
+    ],
+    "chitchat": {
+        "headline": "Did you know?",
+        "body": "Arweave provides permanent storage for data with a one-time payment, making it ideal for preserving important information forever.",
+        "nature": "tip"
+    },
+    "suggested": {
+        "headline": "Weekly Arweave Report",
+        "body": "Catch up on the latest developments in the Arweave ecosystem with our comprehensive weekly report.",
+        "url": "https://example.com/weekly-report",
+        "nature": "suggested reading"
+    }
+}
+_EXAMPLE_BYTES = json_dumps(_EXAMPLE_NEWS_DATA)
+_EXAMPLE_ETAG = hashlib.blake2b(_EXAMPLE_BYTES, digest_size=8).hexdigest()
+_EXAMPLE_HEADERS = {'ETag': f'"{_EXAMPLE_ETAG}"', 'Cache-Control': 'public, max-age=86400'}
+
+def _json_response(data, status=200):
+    """Serialize data with the shared JSON helpers (orjson when available)."""
+    return app.response_class(json_dumps(data), status=status, mimetype='application/json')
 
 def allowed_file(filename):
     """Check if file extension is allowed."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(ALLOWED_EXTENSIONS)
 
 def validate_json_structure(data):
     """Validate that the JSON has the expected structure for podcast generation."""
@@ -68,52 +134,97 @@ def validate_json_structure(data):
     
     return True, "Valid JSON structure"
 
+def _remove_upload(file_path):
+    """Remove a saved upload that will not be processed."""
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+def _update_job(job_id, **fields):
+    """Apply one state transition to a job's status under the status lock."""
+    with _status_lock:
+        job = job_status.get(job_id)
+        if job is not None:
+            job.update(fields)
+            _status_changed.notify_all()
+
+def _get_job(job_id):
+    """Return a snapshot of a job's status, or None if the job is unknown."""
+    with _status_lock:
+        job = job_status.get(job_id)
+        return dict(job) if job is not None else None
+
+def _get_generator():
+    """Return this worker thread's PodcastGenerator, creating it on first use."""
+    generator = getattr(_thread_state, 'generator', None)
+    # Rebuild if Gemini could not be reached last time, so a transient failure is retried
+    if generator is None or (generator.gemini_service is None and config.is_gemini_configured()):
+        generator = PodcastGenerator(PROJECT_ROOT)
+        _thread_state.generator = generator
+    return generator
+
+def _submit_job(job_id, json_file_path):
+    """Queue a podcast generation job on the worker pool."""
+    future = _POOL.submit(generate_podcast_async, job_id, json_file_path)
+    with _status_lock:
+        _job_futures[job_id] = future
+
 def generate_podcast_async(job_id, json_file_path):
     """Generate podcast asynchronously and update job status."""
     try:
-        job_status[job_id]['status'] = 'processing'
-        job_status[job_id]['message'] = 'Initializing podcast generator...'
+        _update_job(job_id, status='processing', message='Initializing podcast generator...')
         
-        # Initialize podcast generator with base directory
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        generator = PodcastGenerator(base_dir)
+        # Reuse this worker thread's podcast generator
+        generator = _get_generator()
         
-        job_status[job_id]['message'] = 'Processing JSON file...'
+        _update_job(job_id, message='Processing JSON file...')
         
         # Generate podcast
         output_dir = generator.generate_podcast_from_file(json_file_path)
         
         if output_dir and os.path.exists(output_dir):
-            # Find generated files
-            wav_files = list(Path(output_dir).glob("*.wav"))
-            mp3_files = list(Path(output_dir).glob("*.mp3"))
-            txt_files = list(Path(output_dir).glob("ArweaveToday-*.txt"))
+            # Find generated files in a single directory scan
+            wav_files, mp3_files, txt_files = [], [], []
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith('.wav'):
+                        wav_files.append(entry.path)
+                    elif name.endswith('.mp3'):
+                        mp3_files.append(entry.path)
+                    elif (name.startswith('ArweaveToday-') and name.endswith('.txt')
+                          and not name.endswith('.raw.txt')):
+                        # The final script, not the raw one
+                        txt_files.append(entry.path)
             
             audio_file = None
             if mp3_files:
-                audio_file = str(mp3_files[0])
+                audio_file = mp3_files[0]
             elif wav_files:
-                audio_file = str(wav_files[0])
+                audio_file = wav_files[0]
             
-            script_file = str(txt_files[0]) if txt_files else None
+            script_file = txt_files[0] if txt_files else None
             
-            job_status[job_id]['status'] = 'completed'
-            job_status[job_id]['message'] = 'Podcast generated successfully!'
-            job_status[job_id]['audio_file'] = audio_file
-            job_status[job_id]['script_file'] = script_file
-            job_status[job_id]['output_dir'] = output_dir
+            _update_job(job_id,
+                        status='completed',
+                        message='Podcast generated successfully!',
+                        audio_file=audio_file,
+                        script_file=script_file,
+                        output_dir=output_dir)
         else:
-            job_status[job_id]['status'] = 'error'
-            job_status[job_id]['message'] = 'Failed to generate podcast - no output directory created'
+            _update_job(job_id, status='error',
+                        message='Failed to generate podcast - no output directory created')
             
     except Exception as e:
-        job_status[job_id]['status'] = 'error'
-        job_status[job_id]['message'] = f'Error generating podcast: {str(e)}'
+        _update_job(job_id, status='error', message=f'Error generating podcast: {str(e)}')
     
     finally:
         # Clean up uploaded file
-        if os.path.exists(json_file_path):
-            os.remove(json_file_path)
+        _remove_upload(json_file_path)
+
+@app.errorhandler(413)
+def request_too_large(error):
+    """Return a JSON error for request bodies over MAX_UPLOAD_BYTES."""
+    return _json_response({'error': f'Request too large. Maximum size is {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.'}, 413)
 
 @app.route('/')
 def index():
@@ -124,216 +235,250 @@ def index():
 def upload_file():
     """Handle file upload."""
     if 'file' not in request.files:
-        return jsonify({'error': 'No file selected'}), 400
+        return _json_response({'error': 'No file selected'}, 400)
     
     file = request.files['file']
     if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
+        return _json_response({'error': 'No file selected'}, 400)
     
     if not allowed_file(file.filename):
-        return jsonify({'error': 'Invalid file type. Only JSON files are allowed.'}), 400
+        return _json_response({'error': 'Invalid file type. Only JSON files are allowed.'}, 400)
+    
+    job_id = secrets.token_hex(16)
+    # The original name is only kept for display, so it never reaches the filesystem
+    filename = f"{job_id}.json"
+    file_path = os.path.join(UPLOAD_FOLDER, filename)
     
     try:
-        # Read and validate JSON
-        json_content = file.read().decode('utf-8')
-        data = json.loads(json_content)
+        # Stream the upload straight to disk instead of buffering it in memory
+        file.save(file_path)
+        
+        # Parse the raw bytes from disk and validate
+        with open(file_path, 'rb') as f:
+            data = json_loads(f.read())
         
         is_valid, error_msg = validate_json_structure(data)
         if not is_valid:
-            return jsonify({'error': f'Invalid JSON structure: {error_msg}'}), 400
-        
-        # Save file temporarily
-        job_id = str(uuid.uuid4())
-        filename = secure_filename(f"{job_id}_{file.filename}")
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
-        
-        with open(file_path, 'w') as f:
-            f.write(json_content)
+            _remove_upload(file_path)
+            return _json_response({'error': f'Invalid JSON structure: {error_msg}'}, 400)
         
         # Initialize job status
-        job_status[job_id] = {
-            'status': 'queued',
-            'message': 'Job queued for processing',
-            'created_at': datetime.now().isoformat(),
-            'filename': file.filename
-        }
+        with _status_lock:
+            job_status[job_id] = {
+                'status': 'queued',
+                'message': 'Job queued for processing',
+                'created_at': datetime.now().isoformat(),
+                'created_ts': time.time(),
+                'filename': file.filename
+            }
         
-        # Start background processing
-        thread = threading.Thread(target=generate_podcast_async, args=(job_id, file_path))
-        thread.daemon = True
-        thread.start()
+        # Queue background processing
+        _submit_job(job_id, file_path)
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'job_id': job_id,
             'message': 'File uploaded successfully. Processing started.'
         })
         
     except json.JSONDecodeError as e:
-        return jsonify({'error': f'Invalid JSON format: {str(e)}'}), 400
+        _remove_upload(file_path)
+        return _json_response({'error': f'Invalid JSON format: {str(e)}'}, 400)
     except Exception as e:
-        return jsonify({'error': f'Error processing file: {str(e)}'}), 500
+        _remove_upload(file_path)
+        return _json_response({'error': f'Error processing file: {str(e)}'}, 500)
 
 @app.route('/paste', methods=['POST'])
 def paste_json():
     """Handle pasted JSON content."""
+    if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES:
+        return request_too_large(None)
+    
     try:
-        json_content = request.json.get('content', '').strip()
+        body = json_loads(request.get_data(cache=False))
+        json_content = body.get('content', '').strip() if isinstance(body, dict) else ''
         
         if not json_content:
-            return jsonify({'error': 'No JSON content provided'}), 400
+            return _json_response({'error': 'No JSON content provided'}, 400)
+        
+        # Encode once: the same bytes are parsed here and written for the job
+        json_bytes = json_content.encode('utf-8')
         
         # Parse and validate JSON
-        data = json.loads(json_content)
+        data = json_loads(json_bytes)
         
         is_valid, error_msg = validate_json_structure(data)
         if not is_valid:
-            return jsonify({'error': f'Invalid JSON structure: {error_msg}'}), 400
+            return _json_response({'error': f'Invalid JSON structure: {error_msg}'}, 400)
         
         # Save content temporarily
-        job_id = str(uuid.uuid4())
-        filename = f"{job_id}_pasted.json"
+        job_id = secrets.token_hex(16)
+        filename = f"{job_id}.json"
         file_path = os.path.join(UPLOAD_FOLDER, filename)
         
-        with open(file_path, 'w') as f:
-            f.write(json_content)
+        with open(file_path, 'wb') as f:
+            f.write(json_bytes)
         
         # Initialize job status
-        job_status[job_id] = {
-            'status': 'queued',
-            'message': 'Job queued for processing',
-            'created_at': datetime.now().isoformat(),
-            'filename': 'pasted_content.json'
-        }
+        with _status_lock:
+            job_status[job_id] = {
+                'status': 'queued',
+                'message': 'Job queued for processing',
+                'created_at': datetime.now().isoformat(),
+                'created_ts': time.time(),
+                'filename': 'pasted_content.json'
+            }
         
-        # Start background processing
-        thread = threading.Thread(target=generate_podcast_async, args=(job_id, file_path))
-        thread.daemon = True
-        thread.start()
+        # Queue background processing
+        _submit_job(job_id, file_path)
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'job_id': job_id,
             'message': 'JSON content processed successfully. Processing started.'
         })
         
+    except RequestEntityTooLarge as e:
+        return request_too_large(e)
     except json.JSONDecodeError as e:
-        return jsonify({'error': f'Invalid JSON format: {str(e)}'}), 400
+        return _json_response({'error': f'Invalid JSON format: {str(e)}'}, 400)
     except Exception as e:
-        return jsonify({'error': f'Error processing JSON: {str(e)}'}), 500
+        return _json_response({'error': f'Error processing JSON: {str(e)}'}, 500)
 
-@app.route('/status/<job_id>')
-def job_status_check(job_id):
-    """Check the status of a podcast generation job."""
-    if job_id not in job_status:
-        return jsonify({'error': 'Job not found'}), 404
-    
-    status = job_status[job_id].copy()
-    
-    # Add download URLs if completed
+def _with_download_urls(job_id, status):
+    """Add download URLs to a completed job's status snapshot."""
     if status['status'] == 'completed':
         if 'audio_file' in status and status['audio_file']:
             status['audio_download_url'] = url_for('download_file', job_id=job_id, file_type='audio')
         if 'script_file' in status and status['script_file']:
             status['script_download_url'] = url_for('download_file', job_id=job_id, file_type='script')
+    return status
+
+@app.route('/status/<job_id>')
+def job_status_check(job_id):
+    """Check the status of a podcast generation job."""
+    status = _get_job(job_id)
+    if status is None:
+        return _json_response({'error': 'Job not found'}, 404)
+    
+    return _json_response(_with_download_urls(job_id, status))
+
+@app.route('/events/<job_id>')
+def job_events(job_id):
+    """Stream a job's status as Server-Sent Events until it completes or fails."""
+    if _get_job(job_id) is None:
+        return _json_response({'error': 'Job not found'}, 404)
     
-    return jsonify(status)
+    def generate():
+        last_sent = None
+        while True:
+            with _status_changed:
+                _status_changed.wait_for(lambda: job_status.get(job_id) != last_sent,
+                                         timeout=EVENTS_KEEPALIVE_SECONDS)
+                job = job_status.get(job_id)
+                status = dict(job) if job is not None else None
+            
+            if status is None:
+                return
+            if status == last_sent:
+                yield ': keep-alive\n\n'
+                continue
+            
+            last_sent = status
+            payload = json_dumps(_with_download_urls(job_id, dict(status))).decode('utf-8')
+            yield f'data: {payload}\n\n'
+            if status['status'] in ('completed', 'error'):
+                return
+    
+    return app.response_class(stream_with_context(generate()), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/download/<job_id>/<file_type>')
 def download_file(job_id, file_type):
     """Download generated files."""
-    if job_id not in job_status:
-        return jsonify({'error': 'Job not found'}), 404
-    
-    status = job_status[job_id]
+    status = _get_job(job_id)
+    if status is None:
+        return _json_response({'error': 'Job not found'}, 404)
     
     if status['status'] != 'completed':
-        return jsonify({'error': 'Job not completed yet'}), 400
+        return _json_response({'error': 'Job not completed yet'}, 400)
     
     try:
         if file_type == 'audio' and 'audio_file' in status:
             file_path = status['audio_file']
             if os.path.exists(file_path):
-                return send_file(file_path, as_attachment=True)
+                return _send_download(file_path)
         
         elif file_type == 'script' and 'script_file' in status:
             file_path = status['script_file']
             if os.path.exists(file_path):
-                return send_file(file_path, as_attachment=True)
+                return _send_download(file_path)
         
-        return jsonify({'error': 'File not found'}), 404
+        return _json_response({'error': 'File not found'}, 404)
         
     except Exception as e:
-        return jsonify({'error': f'Error downloading file: {str(e)}'}), 500
+        return _json_response({'error': f'Error downloading file: {str(e)}'}, 500)
+
+def _send_download(file_path):
+    """Send a generated file, delegating to nginx when X-Accel-Redirect is configured."""
+    relative_path = os.path.relpath(file_path, GENERATED_OUTPUT_ROOT)
+    if not X_ACCEL_REDIRECT_PREFIX or relative_path.startswith('..'):
+        return send_file(file_path, as_attachment=True)
+    
+    response = app.response_class(
+        mimetype=mimetypes.guess_type(file_path)[0] or 'application/octet-stream')
+    response.headers['X-Accel-Redirect'] = (X_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/'
+                                            + quote(relative_path.replace(os.sep, '/')))
+    response.headers['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_path)}"'
+    return response
 
 @app.route('/example')
 def example_json():
     """Show example JSON structure."""
-    example = {
-        "topics": [
-            {
-                "headline": "Arweave Network Upgrade Announcement",
-                "body": "The Arweave team has announced a major network upgrade that will improve transaction throughput and reduce storage costs. This upgrade introduces new consensus mechanisms and optimizes data retrieval performance.",
-                "url": "https://example.com/arweave-upgrade",
-                "nature": "development",
-                "video": "https://youtube.com/watch?v=example1"
-            },
-            {
-                "headline": "New Permaweb Applications Launch", 
-                "body": "Several innovative applications have been launched on the Permaweb this week, including a decentralized social media platform and a permanent document storage service.",
-                "url": "https://example.com/permaweb-apps",
-                "nature": "community"
-            }
-        ],
-        "chitchat": {
-            "headline": "Did you know?",
-            "body": "Arweave provides permanent storage for data with a one-time payment, making it ideal for preserving important information forever.",
-            "nature": "tip"
-        },
-        "suggested": {
-            "headline": "Weekly Arweave Report",
-            "body": "Catch up on the latest developments in the Arweave ecosystem with our comprehensive weekly report.",
-            "url": "https://example.com/weekly-report",
-            "nature": "suggested reading"
-        }
-    }
-    
-    return jsonify(example)
+    if _EXAMPLE_ETAG in request.if_none_match:
+        return app.response_class(status=304, headers=_EXAMPLE_HEADERS)
+    return app.response_class(_EXAMPLE_BYTES, mimetype='application/json',
+                              headers=_EXAMPLE_HEADERS)
 
 @app.route('/cleanup')
 def cleanup():
     """Clean up old jobs and files (admin endpoint)."""
     try:
-        current_time = datetime.now()
+        cutoff = time.time() - 86400  # 24 hours
         cleaned_jobs = 0
         
-        # Remove jobs older than 24 hours
-        for job_id in list(job_status.keys()):
-            job_time = datetime.fromisoformat(job_status[job_id]['created_at'])
-            if (current_time - job_time).total_seconds() > 86400:  # 24 hours
-                del job_status[job_id]
-                cleaned_jobs += 1
+        # Remove jobs older than 24 hours: one float compare per job under the lock
+        with _status_lock:
+            expired = [job_id for job_id, job in job_status.items() if job['created_ts'] < cutoff]
+            for job_id in expired:
+                future = _job_futures.pop(job_id, None)
+                if future is not None:
+                    # Jobs still waiting in the queue are dropped
+                    future.cancel()
+                if job_status.pop(job_id, None) is not None:
+                    cleaned_jobs += 1
+            _status_changed.notify_all()
         
         # Clean up old uploaded files
         cleaned_files = 0
-        for filename in os.listdir(UPLOAD_FOLDER):
-            file_path = os.path.join(UPLOAD_FOLDER, filename)
-            if os.path.isfile(file_path):
-                file_time = datetime.fromtimestamp(os.path.getctime(file_path))
-                if (current_time - file_time).total_seconds() > 86400:  # 24 hours
-                    os.remove(file_path)
+        with os.scandir(UPLOAD_FOLDER) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_ctime < cutoff:
+                    os.remove(entry.path)
                     cleaned_files += 1
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'cleaned_jobs': cleaned_jobs,
             'cleaned_files': cleaned_files
         })
         
     except Exception as e:
-        return jsonify({'error': f'Cleanup failed: {str(e)}'}), 500
+        return _json_response({'error': f'Cleanup failed: {str(e)}'}, 500)
 
 if __name__ == '__main__':
+    configure_logging()
+    
     # Check if required environment variables are set
     if not config.GEMINI_API_KEY:
         print("⚠️  Warning: GEMINI_API_KEY not found in environment variables.")